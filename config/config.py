@@ -5,9 +5,41 @@ load_dotenv()
 
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 VECTOR_STORE_DIR = 'log/vector-store'
+PAGE_CACHE_DIR = 'log/page-cache'
+PDF_WORKERS = 1
+EXTRACTION_PROCESSES = 1
+PAGE_TIMEOUT = 120
+PAGE_WINDOW = 8
+TEXT_BACKEND = 'pdfplumber'
+STRIP_REPEATED_LINES = True
+TABLE_FORMAT = 'compact'
+PAGE_INDEX_DB = 'data/training/data_analysis/page_index.db'
+EMBEDDING_CACHE_DB = 'log/embedding-cache.db'
+EMBEDDING_CACHE_SIZE = 10000
+EMBEDDING_BATCH_SIZE = 256
+FILES_PER_BATCH = 10
+EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+EMBEDDING_BACKEND = 'pytorch'
+EMBEDDING_MAX_LENGTH = 256
+ONNX_MODEL_FILE = 'onnx/model_quint8_avx2.onnx'
+BM25_PREFILTER = 0
+CHUNK_INDEX_DB = 'data/training/data_processing/chunk_index.db'
+INFERENCE_CHUNK_INDEX_DB = 'data/inference/intermediate/chunk_index.db'
+BOILERPLATE_MIN_PROJECTS = 0
+CONTEXT_MODEL = 'gpt-3.5-turbo'
+DEFAULT_ENCODING = 'cl100k_base'
+CONTEXT_TOKEN_BUDGETS = {'gpt-3.5-turbo': 4000, 'gpt-4o-mini': 8000, 'gpt-4o': 8000}
+DEFAULT_CONTEXT_TOKENS = 4000
+CHUNK_TOKENS = 2500
+CHUNK_OVERLAP_TOKENS = 12
+FALLBACK_CHUNK_TOKENS = 1250
+FALLBACK_CHUNK_OVERLAP_TOKENS = 25
 
-with open('config/question_mapping.json', 'r') as f:
+# Mappings are read next to this file, so the config can be imported from any working directory
+CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+with open(os.path.join(CONFIG_DIR, 'question_mapping.json'), 'r') as f:
     QUESTION_MAPPING = json.load(f)
 
-with open('config/heading_mapping.json', 'r') as f:
+with open(os.path.join(CONFIG_DIR, 'heading_mapping.json'), 'r') as f:
     HEADING_MAPPING = json.load(f)
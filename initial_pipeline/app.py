@@ -14,6 +14,7 @@ from openai import OpenAI
 import redis
 
 from section import other_entities, project_proponents, ghg_emission_reductions
+from table_serializer import serialize_table
 
 
 search_headers = {
@@ -183,12 +184,7 @@ def extract_text_for_section(pdf, key, start_page, end_page, header, next_header
             page = pdf.pages[i]
             tables = page.extract_tables()
             for table in tables:
-                for row in table:
-                    for cell in row:
-                        if cell:
-                            text += cell + "<=>"
-                    text += "\n"
-                text += "\n"
+                text += serialize_table(table) + "\n\n"
 
             page.flush_cache()
 
@@ -0,0 +1,71 @@
+import re
+
+# Copy of tools/TableSerializer.py from the main pipeline, as the Docker image only contains this folder.
+# Keep both copies in sync so the two pipelines build the same prompts.
+
+# Separator between the cells of a row
+CELL_SEPARATOR = " | "
+
+# Line written below a detected header row
+HEADER_SEPARATOR = "---"
+
+# Cells holding a number, such as years, amounts and percentages
+NUMERIC_PATTERN = re.compile(r"^[\s\d,.\-–%()+]*\d[\s\d,.\-–%()+]*$")
+
+
+def serialize_table(table):
+    """
+    Serialize a table extracted by pdfplumber into compact text, one row per line with cells separated by pipes.
+    Empty rows and columns are dropped, trailing empty cells are elided, and a header row is marked by a separator line.
+
+    :param table: The rows of the table, where each cell is a string, or None for cells merged with a neighbour.
+    :return: The serialized table.
+    """
+    rows = [[_clean_cell(cell) for cell in row] for row in table]
+
+    # Drop rows and columns without any content
+    rows = [row for row in rows if any(row)]
+    width = max((len(row) for row in rows), default=0)
+    columns = [j for j in range(width) if any(j < len(row) and row[j] for row in rows)]
+    rows = [[row[j] if j < len(row) else "" for j in columns] for row in rows]
+
+    lines = []
+    for row in rows:
+        # Elide trailing empty cells, keeping the inner ones so the remaining cells stay aligned with their columns
+        while row and not row[-1]:
+            row = row[:-1]
+        lines.append(CELL_SEPARATOR.join(row))
+
+    if _is_header_row(rows):
+        lines.insert(1, HEADER_SEPARATOR)
+
+    return "\n".join(lines)
+
+
+def _clean_cell(cell):
+    """
+    Normalize the text of a cell onto a single line.
+
+    :param cell: The text of the cell, or None.
+    :return: The text with whitespaces collapsed, and pipes replaced so they are not confused with cell separators.
+    """
+    if cell is None:
+        return ""
+    return " ".join(cell.replace("|", "/").split())
+
+
+def _is_header_row(rows):
+    """
+    Check if the first row of a table is a header, naming the columns of the rows below.
+
+    :param rows: The cleaned rows of the table.
+    :return: True if the first row labels at least two columns without any number, while a later row holds a number.
+    """
+    if len(rows) < 2:
+        return False
+
+    labels = [cell for cell in rows[0] if cell]
+    if len(labels) < 2 or any(NUMERIC_PATTERN.match(cell) for cell in labels):
+        return False
+
+    return any(NUMERIC_PATTERN.match(cell) for row in rows[1:] for cell in row if cell)
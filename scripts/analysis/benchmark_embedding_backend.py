@@ -0,0 +1,109 @@
+import os, math, time, logging, argparse
+import pandas as pd
+from scipy.stats import spearmanr
+from config import config
+from tools.utils import find_pdf_files
+from tools.PDFExtraction import PDFExtraction
+from tools.TokenBudget import get_encoding
+from tools.VectorRetriever import VectorRetriever
+from scripts.processing.context_extractor import _load_embedding, _chunk_relevant_section
+
+# Set up logging configuration with timestamps
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Backends compared, the first being the reference
+BACKENDS = ('pytorch', 'onnx')
+
+
+def main(args):
+    """
+    Main function to compare the quantized ONNX embedding backend with the PyTorch model on the section chunks of PDDs.
+    The throughput of each backend is recorded, with the agreement of their cosine rankings and retrieved chunks per section.
+    """
+    pdf_files = sorted(find_pdf_files(args.input))
+    encoding = get_encoding(config.CONTEXT_MODEL)
+
+    # Chunk the relevant sections of each PDF, as done for context extraction
+    sections = []
+    for index, file in enumerate(pdf_files, start=1):
+        logging.info(f'Chunking [{index}/{len(pdf_files)}] : {file}')
+
+        with PDFExtraction(f"{args.input}/{file}") as pdf_extractor:
+            toc_df = pdf_extractor._get_toc()
+
+            # Only sections with multiple chunks are retrieved from
+            for section, documents in _chunk_relevant_section(pdf_extractor, toc_df, encoding).items():
+                if len(documents) > 1:
+                    sections.append((file, section, documents))
+
+    texts = list(dict.fromkeys(doc.page_content for _, _, documents in sections for doc in documents))
+
+    # Encode all chunks with each backend, without the embedding cache
+    models, vectors, throughput = {}, {}, {}
+    for backend in BACKENDS:
+        models[backend] = _load_embedding(backend, args.batch_size)
+
+        start = time.perf_counter()
+        vectors[backend] = dict(zip(texts, models[backend].embed_documents(texts)))
+        throughput[backend] = len(texts) / (time.perf_counter() - start)
+        logging.info(f'{backend}: {len(texts)} Chunks Embedded, {throughput[backend]:.1f} Chunks/sec')
+
+    rows = []
+    for file, section, documents in sections:
+        query = config.QUESTION_MAPPING[section]
+        k = math.ceil(len(documents)/2)
+
+        retrievers = {backend: VectorRetriever(documents, models[backend], [vectors[backend][doc.page_content] for doc in documents])
+                      for backend in BACKENDS}
+        searches = {backend: retriever._search(query, k) for backend, retriever in retrievers.items()}
+        selected = {backend: retriever._invoke(query, k)[0].page_content for backend, retriever in retrievers.items()}
+
+        reference, candidate = BACKENDS
+        rows.append({'filename': file,
+                     'section': section,
+                     'chunks': len(documents),
+                     # Lowest cosine similarity between the two vectors of a chunk
+                     'vector_cosine': round(float((retrievers[reference].matrix * retrievers[candidate].matrix).sum(axis=1).min()), 4),
+                     # Agreement of the chunks ranked by similarity to the question
+                     'rank_correlation': round(float(spearmanr(searches[reference][1], searches[candidate][1]).statistic), 4),
+                     'same_top1': searches[reference][0][0] == searches[candidate][0][0],
+                     'same_topk': set(searches[reference][0]) == set(searches[candidate][0]),
+                     'same_context': selected[reference] == selected[candidate]})
+
+    df = pd.DataFrame(rows)
+    logging.info(f'\n{df.to_string(index=False)}')
+
+    # Summarise the parity of the rankings and the speed-up of the candidate backend
+    logging.info(f"Sections: {len(df)}, Chunks: {len(texts)}")
+    logging.info(f"Lowest Vector Cosine: {df['vector_cosine'].min()}, Mean Rank Correlation: {df['rank_correlation'].mean():.4f}")
+    logging.info(f"Same Top-1: {df['same_top1'].mean():.1%}, Same Top-k: {df['same_topk'].mean():.1%}, Same Context: {df['same_context'].mean():.1%}")
+    logging.info(f"Throughput: {', '.join(f'{backend} {throughput[backend]:.1f}' for backend in BACKENDS)} Chunks/sec, "
+                 f"{throughput[BACKENDS[1]] / throughput[BACKENDS[0]]:.2f}x Speed-up")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        df.to_csv(args.output, index=False, encoding='utf-8')
+
+
+def _setup_args():
+    """
+    Set up command-line arguments.
+
+    Returns:
+        argparse: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input', type=str, default='initial_pipeline/inputs', nargs='?', help='Input Folder')
+    parser.add_argument('--batch-size', type=int, default=config.EMBEDDING_BATCH_SIZE, help='Number of Chunks Embedded per Batch')
+    parser.add_argument('--output', type=str, default=None, help='Output CSV File')
+    args = parser.parse_args()
+
+    return args
+
+
+if __name__ == "__main__":
+    # Set up command-line arguments
+    args = _setup_args()
+
+    # Execute the main function with the parsed arguments
+    main(args)
@@ -0,0 +1,83 @@
+import os, time, logging, argparse
+import pandas as pd
+from collections import Counter
+from config import config
+from tools.utils import find_pdf_files
+from tools.PDFExtraction import PDFExtraction
+
+# Set up logging configuration with timestamps
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def main(args):
+    """
+    Main function to compare pdfplumber with a fast text backend on reading the text of every PDF page.
+    For each backend, the time of searching keywords and scanning headings is recorded,
+    with the number of pages read by each engine and whether the results agree with pdfplumber.
+    """
+    pdf_files = sorted(find_pdf_files(args.input))
+
+    # Search the heading variants of every section category, as used for locating sections
+    keys = ['|'.join(variants) for variants in config.HEADING_MAPPING.values()]
+    rows = []
+
+    # Process each PDF file in the list
+    for index, file in enumerate(pdf_files, start=1):
+        logging.info(f'Benchmarking [{index}/{len(pdf_files)}] : {file}')
+        results = {}
+
+        for backend in ('pdfplumber', args.backend):
+            # Disable the page cache and the watchdog, so every page is parsed in this process
+            with PDFExtraction(f"{args.input}/{file}", cache_dir=None, page_timeout=None, text_backend=backend) as pdf_extractor:
+                start = time.perf_counter()
+                keywords = pdf_extractor._search_keywords(keys)
+                keyword_seconds = time.perf_counter() - start
+
+                start = time.perf_counter()
+                headings = pdf_extractor._scan_headings(range(pdf_extractor._get_page_count()))
+                heading_seconds = time.perf_counter() - start
+
+                results[backend] = (keywords, headings)
+                rows.append({'filename': file,
+                             'backend': backend,
+                             'pages': pdf_extractor._get_page_count(),
+                             'page_backends': dict(Counter(pdf_extractor.page_backends.values())),
+                             'keyword_seconds': round(keyword_seconds, 3),
+                             'heading_seconds': round(heading_seconds, 3),
+                             'same_keywords': keywords == results['pdfplumber'][0],
+                             'same_headings': headings == results['pdfplumber'][1]})
+
+    df = pd.DataFrame(rows)
+    logging.info(f'\n{df.to_string(index=False)}')
+
+    # Summarise the total time and agreement of each backend
+    summary = df.groupby('backend')[['keyword_seconds', 'heading_seconds', 'same_keywords', 'same_headings']].sum()
+    logging.info(f'\n{summary.to_string()}')
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        df.to_csv(args.output, index=False, encoding='utf-8')
+
+
+def _setup_args():
+    """
+    Set up command-line arguments.
+
+    Returns:
+        argparse: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input', type=str, default='initial_pipeline/inputs', nargs='?', help='Input Folder')
+    parser.add_argument('--backend', type=str, default='pdfium', help='Fast Text Backend compared with pdfplumber')
+    parser.add_argument('--output', type=str, default=None, help='Output CSV File')
+    args = parser.parse_args()
+
+    return args
+
+
+if __name__ == "__main__":
+    # Set up command-line arguments
+    args = _setup_args()
+
+    # Execute the main function with the parsed arguments
+    main(args)
@@ -0,0 +1,50 @@
+import logging, argparse
+from tools.utils import find_pdf_files
+from tools.PageIndex import PageIndex
+from config import config
+
+# Set up logging configuration with timestamps
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def main(args):
+    """
+    Main function to store the text of every PDF page in the full-text page index.
+    Files already indexed with the same content are skipped, so the index is updated incrementally.
+    """
+    pdf_files = find_pdf_files(args.input)
+
+    # If ids are provided, process only those given ids.
+    if args.ids:
+        pdf_files = [f for f in pdf_files if int(f.split('_', 1)[0]) in args.ids]
+
+    page_index = PageIndex(args.db)
+
+    # Process each PDF file in the list
+    for index, file in enumerate(pdf_files, start=1):
+        if page_index._add_document(f"{args.input}/{file}"):
+            logging.info(f'Indexed [{index}/{len(pdf_files)}] : {file}')
+
+
+def _setup_args():
+    """
+    Set up command-line arguments.
+
+    Returns:
+        argparse: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input', type=str, default='data/training/data_collection/pdds', nargs='?', help='Input Folder')
+    parser.add_argument('--ids', type=int, nargs='+',help='Project IDs')
+    parser.add_argument('--db', type=str, default=config.PAGE_INDEX_DB, nargs='?',help='Page Index Database')
+    args = parser.parse_args()
+
+    return args
+
+
+if __name__ == "__main__":
+    # Set up command-line arguments
+    args = _setup_args()
+
+    # Execute the main function with the parsed arguments
+    main(args)
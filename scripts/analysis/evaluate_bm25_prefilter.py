@@ -0,0 +1,113 @@
+import os, math, logging, argparse
+import pandas as pd
+from config import config
+from tools.utils import find_pdf_files
+from tools.PDFExtraction import PDFExtraction
+from tools.TokenBudget import get_encoding, get_token_budget, pack_chunks
+from tools.EmbeddingCache import CachedEmbeddings
+from tools.VectorRetriever import VectorRetriever
+from scripts.processing.context_extractor import _load_embedding, _chunk_relevant_section, _prefilter_chunks
+
+# Set up logging configuration with timestamps
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def main(args):
+    """
+    Main function to measure how often the BM25 prefilter keeps the chunks retrieved by the embedding pipeline.
+    For each section with multiple chunks and each number of kept chunks N, recall@N records whether every chunk packed
+    into the context retrieved from all chunks is among the top-N chunks by BM25, and same@N whether retrieving from
+    those N chunks packs the same context.
+    """
+    pdf_files = sorted(find_pdf_files(args.input))
+    encoding = get_encoding(args.model)
+    budget = get_token_budget(args.model)
+    embedding = CachedEmbeddings(_load_embedding(args.embedding_backend, args.batch_size), database=args.embedding_cache or None)
+    rows = []
+
+    # Process each PDF file in the list
+    for index, file in enumerate(pdf_files, start=1):
+        logging.info(f'Evaluating [{index}/{len(pdf_files)}] : {file}')
+
+        # Chunk the relevant sections of each PDF, as done for context extraction
+        with PDFExtraction(f"{args.input}/{file}") as pdf_extractor:
+            sections = _chunk_relevant_section(pdf_extractor, pdf_extractor._get_toc(), encoding)
+
+        for section, documents in sections.items():
+            if len(documents) <= 1:
+                continue
+
+            question = config.QUESTION_MAPPING[section]
+            k = math.ceil(len(documents)/2)
+
+            # Context retrieved by the current pipeline, embedding every chunk
+            reference = _pack_context(documents, embedding, question, k, encoding, budget)
+
+            row = {'filename': file, 'section': section, 'chunks': len(documents)}
+            for n in args.top_n:
+                candidates = _prefilter_chunks(documents, question, n)
+                row[f'recall@{n}'] = set(reference) <= {doc.page_content for doc in candidates}
+                row[f'same@{n}'] = _pack_context(candidates, embedding, question, k, encoding, budget) == reference
+            rows.append(row)
+
+    df = pd.DataFrame(rows)
+    logging.info(f'\n{df.to_string(index=False)}')
+
+    # Summarise the retrieval quality against the share of chunks left to embed, over all sections,
+    # and over the sections with more than N chunks, such as those of documents falling back to their whole content
+    for n in args.top_n:
+        filtered = df[df['chunks'] > n]
+        logging.info(f"N={n}: Recall {df[f'recall@{n}'].mean():.1%}, Same Context {df[f'same@{n}'].mean():.1%}, "
+                     f"Chunks Embedded {df['chunks'].clip(upper=n).sum() / df['chunks'].sum():.1%} | "
+                     f"{len(filtered)} Sections over {n} Chunks: Recall {filtered[f'recall@{n}'].mean():.1%}, Same Context {filtered[f'same@{n}'].mean():.1%}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        df.to_csv(args.output, index=False, encoding='utf-8')
+
+
+def _pack_context(documents, embedding, question, k, encoding, budget):
+    """
+    Retrieves the context of a section as done for context extraction, packing the ranked chunks up to the token budget.
+
+    Parameters:
+        documents (list): Chunked documents of the section.
+        embedding (CachedEmbeddings): Embedding model to generate vector embeddings.
+        question (str): Question of the section category.
+        k (int): Number of top documents to retrieve before removing redundant ones.
+        encoding (Encoding): Tokenizer of the model receiving the contexts.
+        budget (int): Maximum number of tokens of the context.
+
+    Returns:
+        list: The packed chunk texts, from the most relevant.
+    """
+    ranked = VectorRetriever(documents, embedding)._invoke(question, k, top_n=k)
+    return pack_chunks([doc.page_content for doc in ranked], encoding, budget)
+
+
+def _setup_args():
+    """
+    Set up command-line arguments.
+
+    Returns:
+        argparse: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input', type=str, default='initial_pipeline/inputs', nargs='?', help='Input Folder')
+    parser.add_argument('--top-n', type=int, nargs='+', default=[5, 10, 20, 50], help='Numbers of Chunks Kept by BM25')
+    parser.add_argument('--model', type=str, default=config.CONTEXT_MODEL, help='Model Receiving the Contexts, Setting the Tokenizer and Token Budget')
+    parser.add_argument('--batch-size', type=int, default=config.EMBEDDING_BATCH_SIZE, help='Number of Chunks Embedded per Batch')
+    parser.add_argument('--embedding-backend', type=str, default=config.EMBEDDING_BACKEND, choices=['pytorch', 'onnx'], help='Embedding Model Backend')
+    parser.add_argument('--embedding-cache', type=str, default=config.EMBEDDING_CACHE_DB, help='Embedding Cache Database, Empty to Keep Embeddings in Memory Only')
+    parser.add_argument('--output', type=str, default=None, help='Output CSV File')
+    args = parser.parse_args()
+
+    return args
+
+
+if __name__ == "__main__":
+    # Set up command-line arguments
+    args = _setup_args()
+
+    # Execute the main function with the parsed arguments
+    main(args)
@@ -2,6 +2,7 @@ import os, logging, argparse
 import pandas as pd
 from tools.utils import find_pdf_files, get_filtered_file
 from tools.PDFExtraction import PDFExtraction
+from tools.PageIndex import PageIndex
 
 # Set up logging configuration with timestamps
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -33,15 +34,23 @@ def main(args):
         for _, keywords in kw.items():
             keys.append('|'.join(keywords))
 
+    # Search pages from the full-text page index instead of parsing the PDFs
+    page_index = PageIndex() if args.index else None
+
     # Process each PDF file in the list
     for index, file in enumerate(pdf_files, start=1):
         logging.info(f'=========================================================')
         logging.info(f'Processing [{index}/{len(pdf_files)}] : {file}')
         logging.info(f'=========================================================')
 
-        # Initialize PDF extraction tool
-        pdf_extractor = PDFExtraction(f"{args.input}/{file}")
-        results = pdf_extractor._search_keywords(keys)
+        if page_index:
+            # Index the file if it has not been indexed yet, then search from the index
+            page_index._add_document(f"{args.input}/{file}")
+            results = page_index._search_keywords(file, keys)
+        else:
+            # Initialize PDF extraction tool
+            with PDFExtraction(f"{args.input}/{file}") as pdf_extractor:
+                results = pdf_extractor._search_keywords(keys)
         
         # Map keywords to their categories
         key_name = [list(d.keys())[0] for d in kws]
@@ -69,6 +78,7 @@ def _setup_args():
     parser.add_argument('input', type=str, default='data/training/data_collection/pdds/', nargs='?', help='Input Folder')
     parser.add_argument('--ids', type=int, nargs='+',help='Project IDs')
     parser.add_argument('--output', type=str, default='keywords_found_in_pages', nargs='?',help='Output Folder')
+    parser.add_argument('--index', action='store_true', help='Search Keywords from the Page Index')
     args = parser.parse_args()
 
     return args
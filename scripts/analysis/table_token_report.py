@@ -0,0 +1,84 @@
+import os, logging, argparse
+import pandas as pd
+import tiktoken
+from tools.utils import find_pdf_files
+from tools.PDFExtraction import PDFExtraction
+from tools.TableSerializer import TABLE_FORMATS
+
+# Set up logging configuration with timestamps
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def main(args):
+    """
+    Main function to compare the number of tokens taken by the tables of every PDF page in each serialization format,
+    including the separator format of the initial pipeline.
+    """
+    pdf_files = sorted(find_pdf_files(args.input))
+    encoding = tiktoken.encoding_for_model(args.model)
+
+    formats = {**TABLE_FORMATS, 'separator': _separate_cells}
+    rows = []
+
+    # Process each PDF file in the list
+    for index, file in enumerate(pdf_files, start=1):
+        logging.info(f'Counting [{index}/{len(pdf_files)}] : {file}')
+
+        with PDFExtraction(f"{args.input}/{file}") as pdf_extractor:
+            tables = [table for i in range(pdf_extractor._get_page_count())
+                      for _, table in pdf_extractor._get_page_layout(i)[1]]
+
+        row = {'filename': file, 'tables': len(tables)}
+        for name, serialize in formats.items():
+            row[name] = sum(len(encoding.encode(serialize(table))) for table in tables)
+        rows.append(row)
+
+    df = pd.DataFrame(rows)
+    logging.info(f'\n{df.to_string(index=False)}')
+
+    # Summarise the tokens saved by the compact format against the others
+    totals = df[list(formats)].sum()
+    for name in formats:
+        if name != 'compact' and totals[name]:
+            logging.info(f"Compact Tables: {totals['compact']} Tokens, {1 - totals['compact'] / totals[name]:.1%} less than {name} ({totals[name]} Tokens)")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        df.to_csv(args.output, index=False, encoding='utf-8')
+
+
+def _separate_cells(table):
+    """
+    Serializes a table as the initial pipeline does, following each non-empty cell by a separator.
+
+    Parameters:
+        table (list of lists): The rows of the table.
+
+    Returns:
+        str: The serialized table.
+    """
+    return ''.join(''.join(cell + '<=>' for cell in row if cell) + '\n' for row in table)
+
+
+def _setup_args():
+    """
+    Set up command-line arguments.
+
+    Returns:
+        argparse: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('input', type=str, default='initial_pipeline/inputs', nargs='?', help='Input Folder')
+    parser.add_argument('--model', type=str, default='gpt-3.5-turbo', help='Model whose Tokenizer Counts the Tokens')
+    parser.add_argument('--output', type=str, default=None, help='Output CSV File')
+    args = parser.parse_args()
+
+    return args
+
+
+if __name__ == "__main__":
+    # Set up command-line arguments
+    args = _setup_args()
+
+    # Execute the main function with the parsed arguments
+    main(args)
@@ -1,10 +1,18 @@
-import os, re, logging , math, argparse
+import os, re, time, logging , math, argparse
 import pandas as pd
+import torch
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter
 from config import config
 from tools.PDFExtraction import PDFExtraction
+from tools.EmbeddingCache import CachedEmbeddings
+from tools.OnnxEmbeddings import OnnxEmbeddings
+from tools.VectorRetriever import VectorRetriever
+from tools.BM25 import BM25
+from tools.ChunkIndex import ChunkIndex
+from tools.TokenBudget import get_encoding, get_token_budget, count_tokens, pack_chunks
 from tools.utils import find_pdf_files, get_filtered_file
 from langchain_chroma import Chroma
-from langchain_community.document_loaders import PyPDFLoader
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain.retrievers import ContextualCompressionRetriever
 from langchain_community.document_transformers import EmbeddingsRedundantFilter
@@ -17,10 +25,14 @@ from retry import retry
 # Set up logging configuration with timestamps
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Arguments and loaded embedding model of a worker process, set once by _init_worker
+_worker = {}
+
 @retry(tries=50, delay=2)
 def main(args):
     """
     Main function to process PDF files for context extraction based on the table of contents.
+    Files are processed either in this process, or by a pool of worker processes each keeping its own embedding model loaded.
     Extracted context is saved to a specified output file.
     """
     # If ids are provided, process only those given ids.
@@ -28,45 +40,195 @@ def main(args):
     # Also, filter out all the processed ids
     pdf_files = get_filtered_file(find_pdf_files(args.input), args.ids, args.output)
 
-    if pdf_files:
-        # Initialize an embedding model using HuggingFace
-        embedding = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2") 
+    if pdf_files and args.processes > 1:
+        # Each worker process loads the embedding model once, then extracts the files pulled from the pool queue one at a time,
+        # while this process is the single writer of the output file, appending the contexts in the order of the files
+        with ProcessPoolExecutor(args.processes, initializer=_init_worker, initargs=(args,)) as executor:
+            for index, context_df in enumerate(executor.map(_extract_file, pdf_files), start=1):
+                _append_output(context_df, args.output)
+                logging.info(f'Saved Context [{index}/{len(pdf_files)}] : {pdf_files[index - 1]}')
 
-        # Iterate over each file and process it
-        for index, file in enumerate(pdf_files, start=1):
-            logging.info(f'Processing Context Extraction [{index}/{len(pdf_files)}] : {file}')
-            
-            # Extract table of contents from each PDF file
-            pdf_extractor = PDFExtraction(f"{args.input}/{file}")
-            toc_df = pdf_extractor._get_toc()
-            logging.info('Sucessfully Retrieve ToC')
+    elif pdf_files:
+        # Initialize an embedding model, encoding each unique chunk and question only once
+        # across the vector store, the redundancy filter and the relevance filter, and across reruns
+        embedding = CachedEmbeddings(_load_embedding(args.embedding_backend, args.batch_size), database=args.embedding_cache or None)
+
+        # Process the files in bounded groups, saving the contexts of each group before chunking the next one,
+        # so a failing file only loses the progress of its group and memory does not grow with the corpus
+        for start in range(0, len(pdf_files), args.files_per_batch):
+            group = pdf_files[start:start + args.files_per_batch]
+            logging.info(f'Processing Files [{start + 1}-{start + len(group)}/{len(pdf_files)}]')
 
-            # Extract relevant sections
-            context_df = _extract_relevant_section(pdf_extractor, toc_df, embedding, file)
-            context_df['id'] = file.split('_', 1)[0]
-            context_df['filename'] = file
+            for context_df in _extract_contexts(group, args, embedding):
+                # Append extracted data to the output file
+                _append_output(context_df, args.output)
+
+        logging.info(f'Embedding Cache: {dict(embedding.stats)}')
+
+
+def _init_worker(args):
+    """
+    Loads the embedding model of a worker process, sharing the CPU cores evenly between the worker processes.
 
-            # Append extracted data to the output file
-            context_df.to_csv(args.output,  mode='a', header=not os.path.exists(args.output), index=False, encoding='utf-8')
+    Parameters:
+        args (argparse.Namespace): The parsed arguments.
+    """
+    threads = max(1, (os.cpu_count() or 1) // args.processes)
+    _worker['args'] = args
+    _worker['embedding'] = CachedEmbeddings(_load_embedding(args.embedding_backend, args.batch_size, threads),
+                                            database=args.embedding_cache or None)
+
+
+def _extract_file(file):
+    """
+    Extracts the contexts of a single file in a worker process, using its loaded embedding model.
+
+    Parameters:
+        file (str): PDF filename to be processed.
+
+    Returns:
+        DataFrame: The extracted contexts of the file.
+    """
+    return next(_extract_contexts([file], _worker['args'], _worker['embedding']))
+
+
+def _extract_contexts(pdf_files, args, embedding):
+    """
+    Extracts the contexts of a group of PDF files in three phases. The sections of the files are chunked first,
+    their chunks are then embedded in large batches, and the most relevant chunks of each section are finally retrieved
+    using the precomputed embeddings.
+
+    Parameters:
+        pdf_files (list): PDF filenames to be processed.
+        args (argparse.Namespace): The parsed arguments.
+        embedding (CachedEmbeddings): Embedding model to generate vector embeddings.
+
+    Yields:
+        DataFrame: The extracted contexts of each file, in the order of the files.
+    """
+    # Chunks and contexts are measured with the tokenizer of the model receiving the contexts
+    encoding = get_encoding(args.model)
+    budget = get_token_budget(args.model)
+    logging.info(f'Context Budget: {budget} Tokens per Record ({args.model}, {encoding.name})')
+
+    # Phase one: chunk the relevant sections of every file of the group
+    chunks = {}
+    for index, file in enumerate(pdf_files, start=1):
+        logging.info(f'Processing Context Extraction [{index}/{len(pdf_files)}] : {file}')
+        
+        # Extract table of contents from each PDF file, closing the file once its sections are extracted
+        with PDFExtraction(f"{args.input}/{file}", workers=args.workers) as pdf_extractor:
+            toc_df = pdf_extractor._get_toc(use_printed_toc=args.printed_toc)
+            logging.info('Sucessfully Retrieve ToC')
+
+            # Extract and chunk relevant sections
+            chunks[file] = _chunk_relevant_section(pdf_extractor, toc_df, encoding)
+            logging.info(f'Page Extraction Profiles: {dict(Counter(pdf_extractor.page_profiles.values()))}')
+            logging.info(f"Repeated Headers/Footers Removed: {pdf_extractor.repeated_line_stats['removed_chars']} of {pdf_extractor.repeated_line_stats['total_chars']} Characters")
+
+    # Drop the template boilerplate repeated verbatim across many projects of the corpus
+    if args.boilerplate:
+        chunk_index = ChunkIndex(args.chunk_index)
+        try:
+            _drop_boilerplate(chunks, chunk_index, args.boilerplate)
+        finally:
+            chunk_index.close()
+
+    # Optionally keep only the chunks of each section lexically closest to its question, so fewer chunks are embedded
+    candidates = {file: {section: _prefilter_chunks(documents, config.QUESTION_MAPPING[section], args.prefilter)
+                         for section, documents in sections.items()}
+                  for file, sections in chunks.items()}
+
+    # Phase two: embed the unique candidate chunks of all sections with multiple chunks, which are retrieved from
+    texts = list(dict.fromkeys(doc.page_content for file, sections in chunks.items()
+                                                 for section, documents in sections.items() if len(documents) > 1
+                                                 for doc in candidates[file][section]))
+    vectors = _embed_chunks(texts, embedding, args.batch_size)
+
+    # Phase three: retrieve the most relevant chunks of each section
+    for index, (file, sections) in enumerate(chunks.items(), start=1):
+        logging.info(f'Retrieving Context [{index}/{len(chunks)}] : {file}')
+
+        context_df = _retrieve_relevant_section(sections, candidates[file], embedding, vectors, file, encoding, budget, args.persist)
+        context_df['id'] = file.split('_', 1)[0]
+        context_df['filename'] = file
+        yield context_df
             
 
-def _extract_relevant_section(pdf, toc, embedding, file):
+def _append_output(df, output):
+    """
+    Appends extracted contexts to the output file, aligning them with the columns of an existing file.
+    Columns introduced since the file was written, such as the context token counts, are added to it and left empty for earlier records.
+
+    Parameters:
+        df (DataFrame): Extracted contexts of a file.
+        output (str): Path to the output CSV file.
+    """
+    if os.path.exists(output):
+        columns = pd.read_csv(output, nrows=0, encoding='utf-8').columns.tolist()
+        missing = [column for column in df.columns if column not in columns]
+        if missing:
+            columns += missing
+            pd.read_csv(output, encoding='utf-8').reindex(columns=columns).to_csv(output, index=False, encoding='utf-8')
+        df = df.reindex(columns=columns)
+
+    df.to_csv(output, mode='a', header=not os.path.exists(output), index=False, encoding='utf-8')
+
+
+def _load_embedding(backend, batch_size, threads=None):
     """
-    Extracts relevant sections from a PDF based on table of contents and returns a DataFrame with context 
+    Loads the embedding model of the given backend.
+
+    Parameters:
+        backend (str): 'pytorch' for the sentence-transformers model, or 'onnx' for its int8-quantized ONNX export.
+        batch_size (int): Number of chunks encoded per run of the model.
+        threads (int, optional): Number of CPU threads used by the model, all cores if not given.
+
+    Returns:
+        Embeddings: The embedding model.
+    """
+    if backend == 'onnx':
+        return OnnxEmbeddings(config.EMBEDDING_MODEL, batch_size=batch_size, threads=threads)
+
+    if threads:
+        torch.set_num_threads(threads)
+
+    # Initialize an embedding model using HuggingFace
+    return HuggingFaceEmbeddings(model_name=config.EMBEDDING_MODEL, encode_kwargs={'batch_size': batch_size})
+
+
+def _chunk_relevant_section(pdf, toc, encoding):
+    """
+    Extracts relevant sections from a PDF based on table of contents and splits them into chunks
     for each type of information.
 
     Parameters:
         pdf (PDFExtraction): PDF extraction instance for retrieving content.
         toc (DataFrame): Table of contents DataFrame.
-        embedding (HuggingFaceEmbeddings): Embedding model to generate vector embeddings.
-        file (str): PDF filename to be processed.
+        encoding (Encoding): Tokenizer measuring the size of the chunks.
 
     Returns:
-        DataFrame: A DataFrame containing category of the section and coresponding extracted context.
+        dict: The chunked documents of each section category.
     """
     # Set up a next section column to stop extract content when reaching next section
     toc['next_section'] = toc['section'].shift(-1, fill_value='')
-    rows = []
+    sections = {}
+
+    if not toc.empty:
+        # Parse the pages of all sections to be extracted in parallel page shards, before extracting them one by one
+        matched_dfs = [_match_sections(toc, variants) for variants in config.HEADING_MAPPING.values()]
+        pdf._prefetch_pages(sorted({page for matched_df in matched_dfs
+                                         for start, end in zip(matched_df['start_page'], matched_df['end_page'])
+                                         for page in range(start, end + 1)}))
+    else:
+        # If ToC is empty, load full content of PDF as documents and split them once for all categories,
+        # reusing the page text read when scanning every page for headings instead of parsing the file again
+        pages = [Document(page_content=pdf._get_page_text(i, 'toc').encode('utf-8', 'replace').decode('utf-8'), metadata={'source': pdf.filename, 'page': i})
+                 for i in range(pdf._get_page_count())]
+        splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(encoding_name=encoding.name, disallowed_special=(),
+                                                                        chunk_size=config.FALLBACK_CHUNK_TOKENS,
+                                                                        chunk_overlap=config.FALLBACK_CHUNK_OVERLAP_TOKENS)
+        fallback_chunks = splitter.split_documents(pages)
 
     # Process each section specified in the headings mapping
     for i, (section, variants) in enumerate(config.HEADING_MAPPING.items(), start=1):
@@ -74,22 +236,8 @@ def _extract_relevant_section(pdf, toc, embedding, file):
         if not toc.empty:
             documents = []
 
-            # Pattern to match section headings
-            pattern = '|'.join([re.escape(variant) for variant in variants])
-
             # Filter matched sections
-            matched_df = toc[toc['section'].str.contains(pattern, case=False, na=False)]
-
-            # Define chunking parameters
-            b_size, b_overlap = 10000, 50
-
-            # Extract text from matched or unmatched sections in the document
-            # If there is at least one matched section found in the document,
-            # Will extract the contents under all matched sections separately
-            # If there is no matched section found in the document,
-            # Will extract the contents under all headings found in the document
-            if matched_df.empty:
-                matched_df = toc
+            matched_df = _match_sections(toc, variants)
 
             # Iteratively process each section
             for i, row in matched_df.iterrows():
@@ -102,59 +250,214 @@ def _extract_relevant_section(pdf, toc, embedding, file):
                 doc = Document(page_content=context.encode('utf-8', 'replace').decode('utf-8'))
                 documents.append(doc)
 
-        # If ToC is empty, load full content of PDF as documents
+            # Split documents into manageable chunks based on defined size and overlap, measured with the model tokenizer
+            splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(encoding_name=encoding.name, disallowed_special=(),
+                                                                            chunk_size=config.CHUNK_TOKENS,
+                                                                            chunk_overlap=config.CHUNK_OVERLAP_TOKENS)
+            sections[section] = splitter.split_documents(documents)
+
+        # If ToC is empty, use the chunks of the full content of PDF
         else:
-            documents = PyPDFLoader(f'{args.input}/{file}').load()
-            b_size, b_overlap = 5000, 100
+            sections[section] = list(fallback_chunks)
+
+    return sections
+
+
+def _drop_boilerplate(chunks, chunk_index, min_projects):
+    """
+    Records the chunks of every file in the corpus-wide chunk index, then removes the chunks found in many projects.
+
+    Parameters:
+        chunks (dict): The chunked documents of each section category, for each file. Updated in place.
+        chunk_index (ChunkIndex): Index of the projects containing each chunk.
+        min_projects (int): Number of projects from which a chunk is considered boilerplate.
+    """
+    # Record all files first, so chunks shared by the files of the same group are counted
+    for file, sections in chunks.items():
+        chunk_index._add_document(file.split('_', 1)[0], [doc.page_content for documents in sections.values() for doc in documents])
 
-        # Split documents into manageable chunks based on defined size and overlap
-        splitter = RecursiveCharacterTextSplitter(chunk_size=b_size, chunk_overlap=b_overlap)
-        documents = splitter.split_documents(documents)          
+    dropped, total = 0, 0
+    for sections in chunks.values():
+        for section, documents in sections.items():
+            frequencies = chunk_index._get_frequencies([doc.page_content for doc in documents])
+            kept = [doc for doc, frequency in zip(documents, frequencies) if frequency < min_projects]
+
+            # Keep the chunks of sections made of boilerplate only, so a context is still retrieved
+            if kept:
+                sections[section] = kept
+            dropped += len(documents) - len(sections[section])
+            total += len(documents)
+
+    logging.info(f'Boilerplate Chunks Dropped: {dropped} of {total} Chunks')
+
+
+def _prefilter_chunks(documents, question, top_n):
+    """
+    Keeps the chunks of a section scoring highest against its question with BM25.
+
+    Parameters:
+        documents (list): Chunked documents of the section.
+        question (str): Question of the section category.
+        top_n (int): Number of chunks to keep, or 0 to keep all chunks.
+
+    Returns:
+        list: The kept documents, in their original order.
+    """
+    if not top_n or len(documents) <= top_n:
+        return documents
+
+    indexes = BM25([doc.page_content for doc in documents])._top(question, top_n)
+    return [documents[i] for i in indexes]
+
+
+def _embed_chunks(texts, embedding, batch_size):
+    """
+    Embeds chunks in large batches, logging the throughput of the embedding model.
+
+    Parameters:
+        texts (list): Unique chunk texts to be embedded.
+        embedding (CachedEmbeddings): Embedding model to generate vector embeddings.
+        batch_size (int): Number of chunks embedded per call of the embedding model.
+
+    Returns:
+        dict: The embedding of each chunk text.
+    """
+    vectors = {}
+    encoded = embedding.stats['encoded']
+    start = time.perf_counter()
+
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i:i + batch_size]
+        vectors.update(zip(batch, embedding.embed_documents(batch)))
+
+        # Chunks read from the embedding cache are counted, but not encoded again
+        elapsed = time.perf_counter() - start
+        logging.info(f"Embedded Chunks [{len(vectors)}/{len(texts)}] : {embedding.stats['encoded'] - encoded} Encoded, {len(vectors) / elapsed:.1f} Chunks/sec")
+
+    return vectors
+
+
+def _retrieve_relevant_section(sections, candidates, embedding, vectors, file, encoding, budget, persist=False):
+    """
+    Retrieves the most relevant chunks of each section and returns a DataFrame with context 
+    for each type of information.
+
+    Parameters:
+        sections (dict): The chunked documents of each section category.
+        candidates (dict): The documents of each section category kept by the lexical prefilter.
+        embedding (CachedEmbeddings): Embedding model to generate vector embeddings.
+        vectors (dict): Precomputed embedding of each candidate chunk text.
+        file (str): PDF filename to be processed.
+        encoding (Encoding): Tokenizer of the model receiving the contexts.
+        budget (int): Maximum number of tokens of each context.
+        persist (bool): Whether to save a Chroma vector store per section, instead of retrieving from embeddings kept in memory.
+
+    Returns:
+        DataFrame: A DataFrame containing category of the section, coresponding extracted context and its number of tokens.
+    """
+    rows = []
+
+    for section, documents in sections.items():
 
         # If multiple documents are found, Create a vector store to extract the most relevant representation
         if len(documents) > 1:
             logging.info(f'{len(documents)} Docs Found in section {section}')
 
-            # Create a vector store from the document embeddings for retrieval
-            vectorstore = Chroma.from_documents(documents, embedding,
-                                                # Set retrieval to use cosine similarity
-                                                collection_metadata={"hnsw:space": "cosine"},
-                                                # Directory to save the vector store per section/file ID
-                                                persist_directory=f"{config.VECTOR_STORE_DIR}/{file.split('_', 1)[0]}/{section}")
-            
             # Define the number of top documents to retrieve, setting it to half the total documents to reduce redundancy
             k = math.ceil(len(documents)/2)
 
-            # Create a retriever to find the top-k most relevant documents based on vector similarity
-            retriever = vectorstore.as_retriever(search_kwargs={"k":k})
-            
-            # Set up a document compression pipeline to refine and compress retrieved documents further
-            compressor = DocumentCompressorPipeline(transformers=[
-                                                                # Filter out redundant or near-duplicate content
-                                                                EmbeddingsRedundantFilter(embeddings=embedding), 
-                                                                # Further compress by selecting the most relevant subset
-                                                                EmbeddingsFilter(embeddings=embedding, k=1)])
-            
-            # Create a retriever that combines retrieval and compression, producing a refined list of relevant documents
-            compressor_retriever = ContextualCompressionRetriever(
-                                                                # Base retriever for initial selection
-                                                                base_retriever=retriever, 
-                                                                # Compressor to further refine retrieved content
-                                                                base_compressor=compressor)
-            
-            # Retrieve and compress the documents by invoking the retriever with specific questions from the mapping
-            documents = compressor_retriever.invoke(config.QUESTION_MAPPING[section])
+            # Retrieve among the candidate documents, which are all documents unless the prefilter is enabled
+            documents = candidates[section]
 
-        # Join the compressed document content to create the context text for the section
-        context = '\n'.join([doc.page_content for doc in documents])    
+            if persist:
+                documents = _retrieve_from_vector_store(documents, embedding, file, section, k)
+            else:
+                # Retrieve the top-k documents and filter out near-duplicates with matrix operations,
+                # ranking the remaining ones from the most relevant
+                retriever = VectorRetriever(documents, embedding, [vectors[doc.page_content] for doc in documents])
+                documents = retriever._invoke(config.QUESTION_MAPPING[section], k, top_n=k)
 
-        # Append a dictionary with the section category and extracted context to the rows list
-        rows.append({'section_category': section, 'context': context})
+        # Pack the most relevant document content first into the context text for the section, up to the token budget
+        context = '\n'.join(pack_chunks([doc.page_content for doc in documents], encoding, budget))
+
+        # Append a dictionary with the section category, extracted context and its size to the rows list
+        rows.append({'section_category': section, 'context': context, 'context_tokens': count_tokens(context, encoding)})
     df = pd.DataFrame(rows)
 
     return df 
 
 
+def _retrieve_from_vector_store(documents, embedding, file, section, k):
+    """
+    Retrieves the most relevant documents of a section through a Chroma vector store saved to disk,
+    ranked the same way as the documents retrieved from embeddings kept in memory.
+
+    Parameters:
+        documents (list): Chunked documents of the section.
+        embedding (CachedEmbeddings): Embedding model to generate vector embeddings.
+        file (str): PDF filename to be processed.
+        section (str): Section category, whose question is used for retrieval.
+        k (int): Number of top documents to retrieve before compression.
+
+    Returns:
+        list: The retrieved and compressed documents, from the most relevant.
+    """
+    # Create a vector store from the document embeddings for retrieval
+    vectorstore = Chroma.from_documents(documents, embedding,
+                                        # Set retrieval to use cosine similarity
+                                        collection_metadata={"hnsw:space": "cosine"},
+                                        # Directory to save the vector store per section/file ID
+                                        persist_directory=f"{config.VECTOR_STORE_DIR}/{file.split('_', 1)[0]}/{section}")
+    
+    # Create a retriever to find the top-k most relevant documents based on vector similarity
+    retriever = vectorstore.as_retriever(search_kwargs={"k":k})
+    
+    # Set up a document compression pipeline to refine and compress retrieved documents further
+    compressor = DocumentCompressorPipeline(transformers=[
+                                                        # Filter out redundant or near-duplicate content
+                                                        EmbeddingsRedundantFilter(embeddings=embedding), 
+                                                        # Rank the remaining documents from the most relevant, to be packed up to the token budget
+                                                        EmbeddingsFilter(embeddings=embedding, k=k)])
+    
+    # Create a retriever that combines retrieval and compression, producing a refined list of relevant documents
+    compressor_retriever = ContextualCompressionRetriever(
+                                                        # Base retriever for initial selection
+                                                        base_retriever=retriever, 
+                                                        # Compressor to further refine retrieved content
+                                                        base_compressor=compressor)
+    
+    # Retrieve and compress the documents by invoking the retriever with specific questions from the mapping
+    documents = compressor_retriever.invoke(config.QUESTION_MAPPING[section])
+
+    return documents
+
+
+def _match_sections(toc, variants):
+    """
+    Finds the sections of the table of contents matching the given heading variants.
+
+    Parameters:
+        toc (DataFrame): Table of contents DataFrame.
+        variants (list): Heading variants of a section category.
+
+    Returns:
+        DataFrame: The matched sections, or all sections of the table of contents if none is matched.
+    """
+    # Pattern to match section headings
+    pattern = '|'.join([re.escape(variant) for variant in variants])
+    matched_df = toc[toc['section'].str.contains(pattern, case=False, na=False)]
+
+    # Extract text from matched or unmatched sections in the document
+    # If there is at least one matched section found in the document,
+    # Will extract the contents under all matched sections separately
+    # If there is no matched section found in the document,
+    # Will extract the contents under all headings found in the document
+    if matched_df.empty:
+        matched_df = toc
+
+    return matched_df
+
+
 def _setup_args():
     """
     Set up command-line arguments.
@@ -166,6 +469,18 @@ def _setup_args():
     parser.add_argument('input', type=str, default='data/training/data_collection/pdds', nargs='?', help='Input PDDs Folder')
     parser.add_argument('--ids', type=int, nargs='+',help='IDs')
     parser.add_argument('--output', type=str, default='data/training/data_processing/pdd_context_retrieval.csv', nargs='?',help='Output Context Filename')
+    parser.add_argument('--workers', type=int, default=config.PDF_WORKERS, help='Number of Processes for Parsing PDF Pages')
+    parser.add_argument('--processes', type=int, default=config.EXTRACTION_PROCESSES, help='Number of Worker Processes Extracting Contexts of Separate PDFs')
+    parser.add_argument('--printed-toc', action='store_true', help='Use Printed Table of Contents to Locate Sections')
+    parser.add_argument('--model', type=str, default=config.CONTEXT_MODEL, help='Model Receiving the Contexts, Setting the Tokenizer and Token Budget')
+    parser.add_argument('--persist', action='store_true', help='Save a Chroma Vector Store per Section under config.VECTOR_STORE_DIR')
+    parser.add_argument('--batch-size', type=int, default=config.EMBEDDING_BATCH_SIZE, help='Number of Chunks Embedded per Batch')
+    parser.add_argument('--files-per-batch', type=int, default=config.FILES_PER_BATCH, help='Number of PDFs Chunked and Embedded Together before Saving Their Contexts')
+    parser.add_argument('--boilerplate', type=int, default=config.BOILERPLATE_MIN_PROJECTS, help='Number of Projects from which a Chunk is Dropped as Boilerplate, 0 to Keep All Chunks')
+    parser.add_argument('--chunk-index', type=str, default=config.CHUNK_INDEX_DB, help='Chunk Index Database Counting the Projects Containing Each Chunk')
+    parser.add_argument('--prefilter', type=int, default=config.BM25_PREFILTER, help='Number of Chunks per Section Kept by BM25 before Embedding, 0 to Embed All Chunks')
+    parser.add_argument('--embedding-backend', type=str, default=config.EMBEDDING_BACKEND, choices=['pytorch', 'onnx'], help='Embedding Model Backend')
+    parser.add_argument('--embedding-cache', type=str, default=config.EMBEDDING_CACHE_DB, help='Embedding Cache Database, Empty to Keep Embeddings in Memory Only')
 
     args = parser.parse_args()
 
@@ -28,11 +28,16 @@ def main(args):
         # Extract relevant pargraphs of each specific question, and save in local directory
         logging.info('Step 1: Context Extraction')
         logging.info('==================================')
-        context_extractor.main(args)
+        # Chunks and contexts are sized with the tokenizer and token budget of the selected model
+        context_extractor.main(argparse.Namespace(**vars(args), model=args.m))
 
         # Read those extracted contexts to dataframe for extracting information using GPT
         context_df = pd.read_csv(args.output, encoding='utf-8')
 
+        # Forecast the number of context tokens sent to the model before any API call
+        pending_df = context_df[context_df['filename'].isin(pdf_files)]
+        logging.info(f"Context Tokens: {int(pending_df['context_tokens'].sum())} in {len(pending_df)} Records")
+
         # Map specific question to each type of information
         context_df['question'] = context_df['section_category'].map(config.QUESTION_MAPPING)
 
@@ -139,6 +144,17 @@ def _setup_args():
     parser.add_argument('--m', type=str, help='Selected Model')
     parser.add_argument('--input', type=str, default='data/inference/input', nargs='?', help='Input Folder')
     parser.add_argument('--output', type=str, default='data/inference/intermediate/context.csv', nargs='?', help='Output File to store extracted context')
+    parser.add_argument('--workers', type=int, default=config.PDF_WORKERS, help='Number of processes for parsing PDF pages')
+    parser.add_argument('--processes', type=int, default=config.EXTRACTION_PROCESSES, help='Number of worker processes extracting contexts of separate PDFs')
+    parser.add_argument('--printed-toc', action='store_true', help='Use printed table of contents to locate sections')
+    parser.add_argument('--persist', action='store_true', help='Save a Chroma vector store per section under config.VECTOR_STORE_DIR')
+    parser.add_argument('--batch-size', type=int, default=config.EMBEDDING_BATCH_SIZE, help='Number of chunks embedded per batch')
+    parser.add_argument('--files-per-batch', type=int, default=config.FILES_PER_BATCH, help='Number of PDFs chunked and embedded together before saving their contexts')
+    parser.add_argument('--boilerplate', type=int, default=config.BOILERPLATE_MIN_PROJECTS, help='Number of projects from which a chunk is dropped as boilerplate, 0 to keep all chunks')
+    parser.add_argument('--chunk-index', type=str, default=config.INFERENCE_CHUNK_INDEX_DB, help='Chunk index database counting the projects containing each chunk, kept apart from training')
+    parser.add_argument('--prefilter', type=int, default=config.BM25_PREFILTER, help='Number of chunks per section kept by BM25 before embedding, 0 to embed all chunks')
+    parser.add_argument('--embedding-backend', type=str, default=config.EMBEDDING_BACKEND, choices=['pytorch', 'onnx'], help='Embedding model backend')
+    parser.add_argument('--embedding-cache', type=str, default=config.EMBEDDING_CACHE_DB, help='Embedding cache database, empty to keep embeddings in memory only')
     args = parser.parse_args()
 
     return args
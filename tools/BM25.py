@@ -0,0 +1,63 @@
+import re
+import numpy as np
+from collections import Counter
+
+# Lowercase words and numbers scored by BM25
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+class BM25:
+    def __init__(self, texts, k1=1.5, b=0.75):
+        """
+        Initializes the BM25 class, ranking texts by their lexical relevance to a query,
+        which is far cheaper than embedding every text.
+
+        Parameters:
+        - texts (list): The texts to be ranked.
+        - k1 (float, optional): The saturation of repeated query terms (default is 1.5).
+        - b (float, optional): The normalization of the scores by the text length (default is 0.75).
+        """
+        self.k1 = k1
+        self.b = b
+        self.counts = [Counter(TOKEN_PATTERN.findall(text.lower())) for text in texts]
+        self.lengths = np.array([sum(counts.values()) for counts in self.counts], dtype=np.float64)
+
+        # Terms found in fewer texts are more discriminative
+        frequencies = Counter(term for counts in self.counts for term in counts)
+        self.idf = {term: np.log((len(texts) - frequency + 0.5) / (frequency + 0.5) + 1) for term, frequency in frequencies.items()}
+
+
+    def _score(self, query):
+        """
+        Scores every text against a query.
+
+        Parameters:
+        - query (str): The query text.
+
+        Returns:
+        - ndarray: The BM25 score of each text.
+        """
+        scores = np.zeros(len(self.counts))
+        if not self.counts:
+            return scores
+
+        norms = self.k1 * (1 - self.b + self.b * self.lengths / max(self.lengths.mean(), 1))
+        for term in set(TOKEN_PATTERN.findall(query.lower())):
+            if term in self.idf:
+                tf = np.array([counts[term] for counts in self.counts], dtype=np.float64)
+                scores += self.idf[term] * tf * (self.k1 + 1) / (tf + norms)
+        return scores
+
+
+    def _top(self, query, n):
+        """
+        Finds the texts most relevant to a query.
+
+        Parameters:
+        - query (str): The query text.
+        - n (int): The number of texts to keep.
+
+        Returns:
+        - list: The indexes of the n highest scoring texts, in their original order.
+        """
+        return sorted(np.argsort(-self._score(query), kind='stable')[:n].tolist())
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import sqlite3
+from config import config
+
+# Maximum number of variables bound in a single SQLite query
+SQLITE_BATCH_SIZE = 500
+
+# Seconds waited for the database to be released by other extraction processes
+SQLITE_TIMEOUT = 60
+
+
+class ChunkIndex:
+    def __init__(self, database=config.CHUNK_INDEX_DB):
+        """
+        Initializes the ChunkIndex class, recording which projects contain each chunk of text, so template boilerplate
+        repeated verbatim across many PDDs can be told apart from the content of a project.
+
+        Parameters:
+        - database (str, optional): The path to the SQLite database file (default is config.CHUNK_INDEX_DB).
+        """
+        os.makedirs(os.path.dirname(database) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(database, timeout=SQLITE_TIMEOUT)
+        self.connection.execute('CREATE TABLE IF NOT EXISTS chunks (hash TEXT, project_id TEXT, PRIMARY KEY (hash, project_id)) WITHOUT ROWID')
+
+
+    def _add_document(self, project_id, texts):
+        """
+        Records the chunks of a project, replacing those recorded when the project was processed before,
+        so processing a project again does not inflate the frequencies.
+
+        Parameters:
+        - project_id (str): The ID of the project.
+        - texts (list): The chunk texts of the project.
+        """
+        hashes = {(hash_chunk(text), project_id) for text in texts}
+
+        with self.connection:
+            self.connection.execute('DELETE FROM chunks WHERE project_id = ?', (project_id,))
+            self.connection.executemany('INSERT INTO chunks VALUES (?, ?)', hashes)
+
+
+    def _get_frequencies(self, texts):
+        """
+        Counts the projects containing each chunk.
+
+        Parameters:
+        - texts (list): The chunk texts.
+
+        Returns:
+        - list: The number of projects containing each chunk, 0 for chunks never recorded.
+        """
+        hashes = [hash_chunk(text) for text in texts]
+        unique = list(dict.fromkeys(hashes))
+        frequencies = {}
+
+        for start in range(0, len(unique), SQLITE_BATCH_SIZE):
+            batch = unique[start:start + SQLITE_BATCH_SIZE]
+            rows = self.connection.execute(f"SELECT hash, COUNT(*) FROM chunks WHERE hash IN ({','.join('?' * len(batch))}) GROUP BY hash", batch)
+            frequencies.update(rows)
+
+        return [frequencies.get(value, 0) for value in hashes]
+
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        self.connection.close()
+
+
+def hash_chunk(text):
+    """
+    Computes the hash of a chunk with its case and whitespaces normalized, so the same paragraph matches across layouts.
+    Digits are kept, as tables of different projects may only differ by their numbers.
+
+    Parameters:
+    - text (str): The chunk text.
+
+    Returns:
+    - str: The hexadecimal SHA-256 digest of the normalized text.
+    """
+    return hashlib.sha256(' '.join(text.lower().split()).encode('utf-8', 'replace')).hexdigest()
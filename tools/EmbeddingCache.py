@@ -0,0 +1,168 @@
+import hashlib
+import os
+import sqlite3
+import numpy as np
+from collections import Counter, OrderedDict
+from langchain_core.embeddings import Embeddings
+from config import config
+
+# Maximum number of variables bound in a single SQLite query
+SQLITE_BATCH_SIZE = 500
+
+# Seconds waited for the database to be released by other extraction processes
+SQLITE_TIMEOUT = 60
+
+
+class CachedEmbeddings(Embeddings):
+    def __init__(self, embedding, database=config.EMBEDDING_CACHE_DB, size=config.EMBEDDING_CACHE_SIZE):
+        """
+        Initializes the CachedEmbeddings class, encoding each unique text only once by keeping its vector
+        in an in-process LRU cache and, optionally, in a local database reused across runs.
+
+        Parameters:
+        - embedding (Embeddings): The embedding model encoding the texts missing from the cache.
+        - database (str, optional): The path to the SQLite database file, or None to keep vectors in memory only
+                                    (default is config.EMBEDDING_CACHE_DB).
+        - size (int, optional): The maximum number of vectors kept in memory (default is config.EMBEDDING_CACHE_SIZE).
+        """
+        self.embedding = embedding
+        self.size = size
+        self.vectors = OrderedDict()
+        self.stats = Counter()
+
+        # Vectors of different models are kept apart, as they cannot be compared
+        self.namespace = getattr(embedding, 'model_name', type(embedding).__name__)
+
+        self.connection = None
+        if database:
+            os.makedirs(os.path.dirname(database) or '.', exist_ok=True)
+            self.connection = sqlite3.connect(database, timeout=SQLITE_TIMEOUT)
+            self.connection.execute('CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)')
+
+
+    def _key(self, kind, text):
+        """
+        Builds the content hash identifying the vector of a text.
+
+        Parameters:
+        - kind (str): The type of the text, 'document' or 'query', as models may encode queries differently.
+        - text (str): The text to be encoded.
+
+        Returns:
+        - str: The hexadecimal SHA-256 digest of the model, type and text.
+        """
+        return hashlib.sha256(f'{self.namespace}\0{kind}\0{text}'.encode('utf-8', 'replace')).hexdigest()
+
+
+    def _remember(self, key, vector):
+        """
+        Keeps a vector in memory, evicting the least recently used vectors beyond the cache size.
+
+        Parameters:
+        - key (str): The content hash of the text.
+        - vector (ndarray): The vector of the text.
+        """
+        self.vectors[key] = vector
+        self.vectors.move_to_end(key)
+        while len(self.vectors) > self.size:
+            self.vectors.popitem(last=False)
+
+
+    def _lookup(self, keys):
+        """
+        Reads the cached vectors of the given keys, from memory first and then from the database.
+
+        Parameters:
+        - keys (list): The content hashes of the texts.
+
+        Returns:
+        - dict: The vector of each cached key.
+        """
+        found = {}
+        for key in keys:
+            if key in self.vectors:
+                self.vectors.move_to_end(key)
+                found[key] = self.vectors[key]
+        self.stats['memory'] += len(found)
+
+        missing = [key for key in keys if key not in found]
+        if self.connection and missing:
+            for start in range(0, len(missing), SQLITE_BATCH_SIZE):
+                batch = missing[start:start + SQLITE_BATCH_SIZE]
+                rows = self.connection.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})", batch)
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+                    self._remember(key, found[key])
+                    self.stats['disk'] += 1
+
+        return found
+
+
+    def _store(self, vectors):
+        """
+        Keeps newly encoded vectors in memory and in the database.
+
+        Parameters:
+        - vectors (dict): The vector of each content hash.
+        """
+        for key, vector in vectors.items():
+            self._remember(key, vector)
+        self.stats['encoded'] += len(vectors)
+
+        if self.connection and vectors:
+            with self.connection:
+                self.connection.executemany('INSERT OR REPLACE INTO embeddings VALUES (?, ?)',
+                                            [(key, vector.tobytes()) for key, vector in vectors.items()])
+
+
+    def embed_documents(self, texts):
+        """
+        Encodes documents, only passing the texts missing from the cache to the embedding model.
+
+        Parameters:
+        - texts (list): The texts to be encoded.
+
+        Returns:
+        - list: The vector of each text, as a list of floats.
+        """
+        keys = [self._key('document', text) for text in texts]
+        found = self._lookup(list(dict.fromkeys(keys)))
+
+        # Encode each missing text once, even if it is repeated in the input
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            encoded = self.embedding.embed_documents(list(missing.values()))
+            vectors = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(missing, encoded)}
+            self._store(vectors)
+            found.update(vectors)
+
+        return [found[key].tolist() for key in keys]
+
+
+    def embed_query(self, text):
+        """
+        Encodes a query, reusing its vector if the same query has been encoded before.
+
+        Parameters:
+        - text (str): The query to be encoded.
+
+        Returns:
+        - list: The vector of the query, as a list of floats.
+        """
+        key = self._key('query', text)
+        found = self._lookup([key])
+
+        if key not in found:
+            found[key] = np.asarray(self.embedding.embed_query(text), dtype=np.float32)
+            self._store({key: found[key]})
+
+        return found[key].tolist()
+
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
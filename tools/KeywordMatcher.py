@@ -0,0 +1,76 @@
+import re
+from collections import defaultdict
+
+
+class KeywordMatcher:
+    def __init__(self, keys):
+        """
+        Initializes the KeywordMatcher class, compiling all keywords into a single pattern which scans a text once.
+
+        Parameters:
+        - keys (list): A list of keywords, where '|' separates alternative spellings of the same keyword
+                       (such as 'methodology|methodologies').
+        """
+        self.keys = keys
+
+        # Map each lowercase spelling to the keywords it belongs to
+        self.variants = defaultdict(set)
+        for key in keys:
+            for variant in key.split('|'):
+                if variant:
+                    self.variants[variant.lower()].add(key)
+
+        # Build a character trie of all spellings, so the pattern branches on each character instead of trying every spelling
+        trie = {}
+        for variant in self.variants:
+            node = trie
+            for char in variant:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        # The lookahead reports the longest spelling starting at every position, including overlapping matches
+        self.pattern = re.compile(f'(?=({self._build_pattern(trie)}))', re.IGNORECASE)
+
+
+    def _build_pattern(self, node):
+        """
+        Converts a trie node into a regular expression, preferring longer spellings.
+
+        Parameters:
+        - node (dict): The trie node mapping each next character to its child node, with '' marking the end of a spelling.
+
+        Returns:
+        - str: The regular expression matching all spellings below the node.
+        """
+        alternatives = [re.escape(char) + self._build_pattern(child) for char, child in node.items() if char]
+        if not alternatives:
+            return ''
+
+        pattern = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+        return f'(?:{pattern})?' if '' in node else pattern
+
+
+    def _scan(self, text):
+        """
+        Finds all keywords in the text.
+
+        Parameters:
+        - text (str): The text to be searched.
+
+        Returns:
+        - dict: A dictionary where each found keyword maps to the list of character offsets where it occurs.
+        """
+        results = defaultdict(list)
+
+        for match in self.pattern.finditer(text):
+            found = match.group(1).lower()
+            keys = set()
+
+            # Shorter spellings which are prefixes of the longest match also occur at the same position
+            for end in range(1, len(found) + 1):
+                keys.update(self.variants.get(found[:end], ()))
+
+            for key in keys:
+                results[key].append(match.start())
+
+        return dict(results)
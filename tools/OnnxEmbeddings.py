@@ -0,0 +1,91 @@
+import numpy as np
+import onnxruntime
+from huggingface_hub import hf_hub_download
+from langchain_core.embeddings import Embeddings
+from tokenizers import Tokenizer
+from config import config
+
+
+class OnnxEmbeddings(Embeddings):
+    def __init__(self, model_name=config.EMBEDDING_MODEL, file_name=config.ONNX_MODEL_FILE,
+                 max_length=config.EMBEDDING_MAX_LENGTH, batch_size=config.EMBEDDING_BATCH_SIZE, threads=None):
+        """
+        Initializes the OnnxEmbeddings class, encoding texts with the int8-quantized ONNX export of a sentence-transformers model,
+        which runs much faster than the PyTorch model on CPU-only machines.
+
+        Parameters:
+        - model_name (str, optional): The Hugging Face repository of the model (default is config.EMBEDDING_MODEL).
+        - file_name (str, optional): The ONNX file within the repository (default is config.ONNX_MODEL_FILE).
+        - max_length (int, optional): The maximum number of tokens encoded per text, the rest being truncated
+                                      as by sentence-transformers (default is config.EMBEDDING_MAX_LENGTH).
+        - batch_size (int, optional): The number of texts encoded per run of the model (default is config.EMBEDDING_BATCH_SIZE).
+        - threads (int, optional): The number of CPU threads running the model, all cores if not given.
+        """
+        # Vectors of the quantized model differ slightly from the original model, so they are cached apart
+        self.model_name = f'{model_name}/{file_name}'
+        self.batch_size = batch_size
+
+        self.tokenizer = Tokenizer.from_file(hf_hub_download(model_name, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length)
+        self.tokenizer.enable_padding()
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads or 0
+        self.session = onnxruntime.InferenceSession(hf_hub_download(model_name, file_name), options, providers=['CPUExecutionProvider'])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+
+    def _encode(self, texts):
+        """
+        Encodes a batch of texts into unit-length vectors, by mean pooling the token embeddings as the sentence-transformers model does.
+
+        Parameters:
+        - texts (list): The texts to be encoded.
+
+        Returns:
+        - ndarray: The vector of each text, one per row.
+        """
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {'input_ids': np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+                  'attention_mask': np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64),
+                  'token_type_ids': np.array([encoding.type_ids for encoding in encodings], dtype=np.int64)}
+        tokens = self.session.run(None, {name: value for name, value in inputs.items() if name in self.input_names})[0]
+
+        # Average the embeddings of the tokens, leaving out the padding
+        mask = inputs['attention_mask'][:, :, None].astype(np.float32)
+        vectors = (tokens * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+
+    def embed_documents(self, texts):
+        """
+        Encodes documents in batches of texts of similar lengths, to limit the padding tokens run through the model.
+
+        Parameters:
+        - texts (list): The texts to be encoded.
+
+        Returns:
+        - list: The vector of each text, as a list of floats.
+        """
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        vectors = [None] * len(texts)
+
+        for start in range(0, len(texts), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            for i, vector in zip(batch, self._encode([texts[i] for i in batch])):
+                vectors[i] = vector.tolist()
+
+        return vectors
+
+
+    def embed_query(self, text):
+        """
+        Encodes a query.
+
+        Parameters:
+        - text (str): The query to be encoded.
+
+        Returns:
+        - list: The vector of the query, as a list of floats.
+        """
+        return self._encode([text])[0].tolist()
@@ -1,17 +1,146 @@
 import pdfplumber
 import re
+import math
+import logging
+from collections import OrderedDict, defaultdict
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pdfminer.pdfdocument import PDFNoOutlines, PDFDestinationNotFound
+from pdfminer.pdftypes import PDFObjRef, resolve1
+from pdfminer.psparser import PSLiteral
+from config import config
+from tools.KeywordMatcher import KeywordMatcher
+from tools.PageCache import PageCache
+from tools.PageWatchdog import PageWatchdog
+from tools.TableSerializer import TABLE_FORMATS
+from tools.TextBackend import TEXT_BACKENDS
+from tools.WordStore import WordStore, cluster_positions
+
+# Attributes kept from each word extracted by pdfplumber
+WORD_KEYS = ('text', 'x0', 'top', 'x1', 'bottom', 'doctop')
+
+# Text extraction settings for each type of cached page text
+TEXT_SETTINGS = {
+    # Text used for searching headings, tighter tolerance to preserve the heading layout
+    'toc': {'x_tolerance': 1, 'y_tolerance': 3},
+    # Text used for searching keywords, using pdfplumber default settings
+    'text': {},
+}
+
+# Format version of the cached pages, to be increased whenever the cached entries change,
+# such as TEXT_SETTINGS, WORD_KEYS, the layout tuple or the repeated line settings
+PAGE_CACHE_VERSION = 2
+
+# Define a pattern to match section headings in the TOC
+# This will capture digits(1-9) or alphabets, followed with dot and digits such as 1.1 or A.1
+# Then, optionally follow with more dot and digits (1.2.1), or only dot at the end (1.2.)
+# Finally, pattern required to be followed with whitespace and uppercase letter
+HEADING_PATTERN = re.compile(r"(?:[1-9]|[a-zA-Z])\.\d+(?:\.\d+|\.|\.\d+\.)?\s+[A-Z]+")
+
+# This will exclude pages containing 10 consecutive dots, dashes, or slashes, which typically indicate a table of contents page to avoid duplicating headings collected from the document's content.
+EXCLUDE_PATTERN = re.compile(r'[\.\-\_]{10,}')
+
+# Remove false headings like "2.1 MW" to ensure only valid headings are retained.
+EXCLUDE_SPACE_MW_PATTERN = re.compile(r'\sMW\s')
+
+# Match entries of a printed table of contents such as "1.2 Project Proponent ........ 7"
+PRINTED_TOC_ENTRY_PATTERN = re.compile(r'^(?P<header>.+?)\s*(?:[\.\-\_…]{3,}|\s)\s*(?P<page>\d+)$')
+
+# Number of leading pages searched for a printed table of contents
+PRINTED_TOC_MAX_PAGES = 10
+
+# Maximum difference searched between printed page numbers and page indexes, such as unnumbered cover pages
+PRINTED_TOC_MAX_OFFSET = 10
+
+# Number of leading printed entries, and of entries spread up to the last one, used to calibrate the page offset
+PRINTED_TOC_SAMPLES = 3
+
+# Minimum number of numbered outline entries required to trust the document outline as the ToC
+MIN_OUTLINE_HEADINGS = 3
+
+# Snapping and joining tolerance of pdfplumber's table detection, within which ruling objects affect each other's tables
+RULING_TOLERANCE = 3
+
+# Number of leading and trailing lines of each page checked for repeated headers and footers
+REPEATED_LINE_CANDIDATES = 3
+
+# Number of pages sampled across the document for finding repeated headers and footers
+REPEATED_LINE_SAMPLES = 12
+
+# Minimum share of the sampled pages on which a line is repeated to be treated as a header or footer
+REPEATED_LINE_MIN_RATIO = 0.5
+
+# Number of page shards assigned to each worker, smaller shards balance the load of uneven pages
+SHARDS_PER_WORKER = 4
 
 class PDFExtraction:
-    def __init__(self, filename):
+    def __init__(self, filename, cache_dir=config.PAGE_CACHE_DIR, workers=config.PDF_WORKERS, page_timeout=config.PAGE_TIMEOUT,
+                 page_window=config.PAGE_WINDOW, text_backend=config.TEXT_BACKEND,
+                 strip_repeated_lines=config.STRIP_REPEATED_LINES, table_format=config.TABLE_FORMAT):
         """
         Initializes the PDFExtraction class.
 
         Parameters:
         - filename (str): The path to the PDF file to be processed.
+        - cache_dir (str, optional): The local directory for caching parsed pages (default is config.PAGE_CACHE_DIR).
+                                     Set to None to disable the page cache.
+        - workers (int, optional): The number of processes used for scanning pages (default is config.PDF_WORKERS).
+        - page_timeout (float, optional): The maximum number of seconds for parsing a single page (default is config.PAGE_TIMEOUT).
+                                          Set to None to parse pages in the current process without a time limit.
+        - page_window (int, optional): The maximum number of parsed pages kept in memory (default is config.PAGE_WINDOW).
+        - text_backend (str, optional): The engine reading the plain text of pages without ruling objects (default is config.TEXT_BACKEND).
+                                        Either 'pdfplumber', or a fast text-only engine from TEXT_BACKENDS such as 'pdfium'.
+        - strip_repeated_lines (bool, optional): Whether to remove headers and footers repeated across pages from extracted sections
+                                                 (default is config.STRIP_REPEATED_LINES).
+        - table_format (str, optional): The format of the tables in extracted sections, one of TABLE_FORMATS (default is config.TABLE_FORMAT).
         """
         self.filename = filename
-        self.pdf = self._read_file()
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.page_timeout = page_timeout
+        self.page_window = page_window
+        self.cache = PageCache(filename, cache_dir, PAGE_CACHE_VERSION) if cache_dir else None
+        self._pdf = None
+
+        # Options of the PDFExtraction instances created in worker processes
+        self.options = {'cache_dir': cache_dir, 'page_timeout': page_timeout, 'page_window': page_window, 'text_backend': text_backend}
+        self.watchdog = PageWatchdog(filename, page_timeout, self.options) if page_timeout else None
+
+        # Pages without ruling objects can only be read as plain text by a faster engine than pdfplumber
+        self.text_backend = TEXT_BACKENDS[text_backend](filename) if text_backend != 'pdfplumber' else None
+
+        # Pages holding parsed objects, ordered from the least to the most recently used
+        self.resident_pages = OrderedDict()
+
+        # Extraction profile chosen for each parsed page, keyed by page number
+        self.page_profiles = {}
+
+        # Engine which has read the text of each parsed page, keyed by page number
+        self.page_backends = {}
+
+        # Text of each extracted section, keyed by its page range and keywords, as sections may be shared between categories
+        self.section_texts = {}
+
+        # Headers and footers repeated across pages, found on first use, with the characters of extracted sections they removed
+        self.strip_repeated_lines = strip_repeated_lines
+        self.serialize_table = TABLE_FORMATS[table_format]
+        self._repeated_lines = None
+        self.repeated_line_stats = {'removed_chars': 0, 'total_chars': 0}
+
+
+    @property
+    def pdf(self):
+        """
+        Opens the PDF file on first access, so documents served entirely from the page cache are never parsed.
+
+        Returns:
+        - The opened PDF object.
+        """
+        if self._pdf is None:
+            self._pdf = self._read_file()
+        return self._pdf
         
 
     def _read_file(self):
@@ -24,39 +153,94 @@ class PDFExtraction:
         return pdfplumber.open(self.filename)
 
 
-    def _get_toc(self):
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def close(self):
+        """
+        Releases the parsed pages, closes the PDF file and stops the watchdog process.
+        """
+        for page in self.resident_pages.values():
+            page.close()
+        self.resident_pages.clear()
+
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+        if self.watchdog is not None:
+            self.watchdog._stop()
+
+        if self.text_backend is not None:
+            self.text_backend.close()
+
+
+    def _get_page(self, i):
+        """
+        Gets a page of the document, releasing the parsed objects of the least recently used pages
+        so that at most page_window pages are kept in memory.
+
+        Parameters:
+        - i (int): The zero-based page index.
+
+        Returns:
+        - The page object initilized using pdfplumber.
+        """
+        if i in self.resident_pages:
+            self.resident_pages.move_to_end(i)
+        else:
+            self.resident_pages[i] = self.pdf.pages[i]
+
+            # Closing a page also clears the text layouts cached for the pages cropped from it
+            while len(self.resident_pages) > self.page_window:
+                _, page = self.resident_pages.popitem(last=False)
+                page.close()
+
+        return self.resident_pages[i]
+
+
+    def _get_toc(self, use_outline=True, use_printed_toc=False):
         """
         Extracts the list of headings from the PDF based on a predefined pattern.
 
+        Parameters:
+        - use_outline (bool, optional): Whether to build the headings from the document outline (bookmarks) when available,
+                                        only scanning the text of every page if the outline is missing or invalid (default is True).
+        - use_printed_toc (bool, optional): Whether to build the headings from the table of contents printed in the document
+                                            when no outline is available, before falling back to scanning every page (default is False).
+
         Returns:
         - DataFrame: A DataFrame containing the sections and their corresponding page ranges.
 
         This code was inspired by the concepts and evolved from the preliminary framework, which is referenced in Appendix 5 of the main report.
         """
-        toc = []
+        pages = range(self._get_page_count())
 
-        # Define a pattern to match section headings in the TOC
-        # This will capture digits(1-9) or alphabets, followed with dot and digits such as 1.1 or A.1
-        # Then, optionally follow with more dot and digits (1.2.1), or only dot at the end (1.2.)
-        # Finally, pattern required to be followed with whitespace and uppercase letter
-        pattern = re.compile(r"(?:[1-9]|[a-zA-Z])\.\d+(?:\.\d+|\.|\.\d+\.)?\s+[A-Z]+")
+        # Read headings from the document outline, which avoids extracting the text of every page
+        toc = self._get_outline_toc() if use_outline else []
 
-        # This will exclude pages containing 10 consecutive dots, dashes, or slashes, which typically indicate a table of contents page to avoid duplicating headings collected from the document's content.
-        exclude_pattern = re.compile(r'[\.\-\_]{10,}')
+        # Read headings from the printed table of contents, which only extracts the leading pages
+        if not toc and use_printed_toc:
+            toc = self._get_printed_toc()
 
-        # Remove false headings like "2.1 MW" to ensure only valid headings are retained.
-        exclude_space_mw_pattern = re.compile(r'\sMW\s')
+        # Otherwise, scan the text of every page for possible headings
+        if not toc:
+            if self.workers > 1 and len(pages) > self.workers:
+                # Split the document into contiguous page shards, each worker opens the file itself to scan its shards
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    results = list(executor.map(_scan_headings, repeat(self.filename), repeat(self.options), self._shard_pages(pages)))
 
-        # Iterately extract content from document's pages
-        for i, page in enumerate(self.pdf.pages):
-            # Extract text from the page, removing duplicate characters and accounting for text layout
-            text = page.dedupe_chars().extract_text(x_tolerance=1, y_tolerance=3)
-            # Filter out table of contents pages
-            if text and 'table of contents' not in text.lower() and \
-                not exclude_pattern.search(text):
-                # Collect line matched with defined patterns
-                toc.extend((line, i) for line in text.splitlines() if pattern.match(line) and not exclude_pattern.search(line) and not exclude_space_mw_pattern.search(line))
-            page.flush_cache()  
+                # Merge the headings of all shards back in page order
+                toc = [heading for headings, _ in results for heading in headings]
+                for _, backends in results:
+                    self.page_backends.update(backends)
+            else:
+                toc = self._scan_headings(pages)
 
         # Filter out invalid headings
         final_toc = self._filter_toc(toc)
@@ -73,6 +257,239 @@ class PDFExtraction:
         return df
     
 
+    def _shard_pages(self, pages):
+        """
+        Splits pages into contiguous shards for the worker processes.
+
+        Parameters:
+        - pages (sequence of int): The zero-based indexes of the pages to be processed.
+
+        Returns:
+        - list: The shards of pages, several per worker to balance the load of uneven pages.
+        """
+        size = math.ceil(len(pages) / (self.workers * SHARDS_PER_WORKER))
+        return [pages[i:i+size] for i in range(0, len(pages), size)]
+
+
+    def _prefetch_pages(self, pages):
+        """
+        Parses the layout of the given pages in parallel page shards, storing them in the page cache before extracting sections.
+        Pages are parsed on first use instead if a single worker is used or the page cache is disabled.
+
+        Parameters:
+        - pages (iterable of int): The zero-based indexes of the pages to be parsed.
+        """
+        if self.workers <= 1 or not self.cache:
+            return
+
+        # Only parse pages which have not been cached yet
+        pages = [i for i in pages if self.cache._get('layout', i) is None or self.cache._get('rulings', i) is None]
+        if len(pages) <= self.workers:
+            return
+
+        # Each worker stores the parsed pages in the page cache, which are read back when extracting sections,
+        # and returns the pages exceeding the time budget, which are only kept in memory
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for profiles, entries in executor.map(_read_pages, repeat(self.filename), repeat(self.options), self._shard_pages(pages)):
+                self.page_profiles.update(profiles)
+                for (kind, i), value in entries.items():
+                    self.cache._set(kind, i, value, persist=False)
+
+
+    def _get_outline_toc(self):
+        """
+        Collects headings from the document outline (bookmarks), reading them from the page cache if available.
+
+        Returns:
+        - list of tuples: The headings and the page index where each heading starts.
+                          Empty if the document has no outline or the outline does not pass the validation.
+        """
+        toc = self.cache._get('outline') if self.cache else None
+        if toc is None:
+            toc = self._read_outline()
+            if self.cache:
+                self.cache._set('outline', None, toc)
+
+        # Only trust outlines with enough numbered headings, in page order and following a valid hierarchy
+        if len(toc) < MIN_OUTLINE_HEADINGS or \
+            any(page < previous for (_, previous), (_, page) in zip(toc, toc[1:])) or \
+            len(self._filter_toc(toc)) != len(toc):
+            return []
+
+        return toc
+
+
+    def _read_outline(self):
+        """
+        Reads the numbered headings of the document outline.
+
+        Returns:
+        - list of tuples: The headings and the page index where each heading starts.
+        """
+        try:
+            outlines = list(self.pdf.doc.get_outlines())
+        except PDFNoOutlines:
+            return []
+
+        # Map page objects to page indexes for resolving outline destinations
+        page_ids = {page.page_obj.pageid: i for i, page in enumerate(self.pdf.pages)}
+
+        toc = []
+        for _, title, dest, action, _ in outlines:
+            # Normalise whitespaces in titles, and keep only titles following the heading pattern like body headings
+            title = ' '.join(title.split())
+            page = self._resolve_outline_page(dest, action, page_ids)
+            if page is not None and HEADING_PATTERN.match(title) and not EXCLUDE_SPACE_MW_PATTERN.search(title):
+                toc.append((title, page))
+
+        return toc
+
+
+    def _resolve_outline_page(self, dest, action, page_ids):
+        """
+        Resolves the page index targeted by an outline entry.
+
+        Parameters:
+        - dest: The destination of the outline entry.
+        - action: The action of the outline entry, used when no destination is given.
+        - page_ids (dict): A mapping from page object IDs to page indexes.
+
+        Returns:
+        - int or None: The page index, or None if the destination cannot be resolved.
+        """
+        # Go-to actions hold the destination under 'D'
+        if dest is None and isinstance(resolve1(action), dict):
+            dest = resolve1(action).get('D')
+        dest = resolve1(dest)
+
+        # Named destinations are looked up from the document catalog
+        if isinstance(dest, (str, bytes, PSLiteral)):
+            try:
+                dest = resolve1(self.pdf.doc.get_dest(dest.name if isinstance(dest, PSLiteral) else dest))
+            except (PDFDestinationNotFound, KeyError):
+                return None
+        if isinstance(dest, dict):
+            dest = resolve1(dest.get('D'))
+
+        # Explicit destinations start with a reference to the target page
+        if isinstance(dest, list) and dest and isinstance(dest[0], PDFObjRef):
+            return page_ids.get(dest[0].objid)
+        return None
+
+
+    def _get_printed_toc(self):
+        """
+        Collects headings from the table of contents printed in the leading pages of the document,
+        converting printed page numbers to page indexes.
+
+        Returns:
+        - list of tuples: The headings and the page index where each heading starts.
+                          Empty if no printed table of contents is found or its page numbers cannot be calibrated.
+        """
+        toc = []
+        contents_pages = set()
+        page_count = self._get_page_count()
+
+        # Collect entries from consecutive table of contents pages
+        for i in range(min(PRINTED_TOC_MAX_PAGES, page_count)):
+            text = self._get_page_text(i, 'toc')
+            if text and ('table of contents' in text.lower() or EXCLUDE_PATTERN.search(text)):
+                contents_pages.add(i)
+                for line in text.splitlines():
+                    entry = PRINTED_TOC_ENTRY_PATTERN.match(line.strip())
+                    if entry and HEADING_PATTERN.match(entry['header']) and not EXCLUDE_SPACE_MW_PATTERN.search(entry['header']):
+                        toc.append((entry['header'].rstrip(' .'), int(entry['page'])))
+            elif toc:
+                # Stop at the first page after the table of contents
+                break
+
+        if len(toc) < MIN_OUTLINE_HEADINGS:
+            return []
+
+        # Convert printed page numbers to page indexes
+        offset = self._calibrate_page_offset(toc, contents_pages)
+        if offset is None:
+            return []
+        toc = [(header, page - 1 + offset) for header, page in toc]
+
+        # Only trust entries in page order, within the document and following a valid hierarchy
+        if any(page < previous for (_, previous), (_, page) in zip(toc, toc[1:])) or \
+            not 0 <= toc[-1][1] < page_count or \
+            len(self._filter_toc(toc)) != len(toc):
+            return []
+
+        return toc
+
+
+    def _calibrate_page_offset(self, toc, contents_pages):
+        """
+        Finds the difference between printed page numbers and page indexes, by locating sample headings in the document.
+        The samples are the leading entries and entries spread up to the last one, so an outdated printed table of contents is rejected.
+
+        Parameters:
+        - toc (list of tuples): The printed headings and their printed page numbers.
+        - contents_pages (set of int): The zero-based indexes of the table of contents pages, where headings are not searched.
+
+        Returns:
+        - int or None: The offset to add to a printed page number (minus one) to get its page index, or None if not found.
+        """
+        indexes = set(range(min(PRINTED_TOC_SAMPLES, len(toc))))
+        indexes.update(np.linspace(0, len(toc) - 1, PRINTED_TOC_SAMPLES).round().astype(int).tolist())
+        samples = [toc[index] for index in sorted(indexes)]
+
+        # Try the most likely offsets first, where printed page numbers follow page indexes
+        for offset in sorted(range(-PRINTED_TOC_MAX_OFFSET, PRINTED_TOC_MAX_OFFSET + 1), key=abs):
+            if all(self._is_heading_on_page(header, page - 1 + offset, contents_pages) for header, page in samples):
+                return offset
+        return None
+
+
+    def _is_heading_on_page(self, header, i, contents_pages=()):
+        """
+        Checks if a heading starts a line on the given page.
+
+        Parameters:
+        - header (str): The heading to be located.
+        - i (int): The zero-based page index.
+        - contents_pages (set of int, optional): The zero-based indexes of the table of contents pages, which always list the headings
+                                                 and are therefore never treated as the page of a heading.
+
+        Returns:
+        - bool: True if the heading is found on the page, False otherwise.
+        """
+        if not 0 <= i < self._get_page_count() or i in contents_pages:
+            return False
+
+        # Compare without whitespaces and case, and only the beginning of long headings which may wrap onto next lines
+        key = ''.join(header.lower().split())[:20]
+        return any(''.join(line.lower().split()).startswith(key) for line in self._get_page_text(i, 'toc').splitlines())
+
+
+    def _scan_headings(self, pages):
+        """
+        Collects all possible headings from the given pages.
+
+        Parameters:
+        - pages (iterable of int): The zero-based indexes of the pages to be scanned.
+
+        Returns:
+        - list of tuples: The possible headings and the page index where each heading is found.
+        """
+        toc = []
+
+        # Iterately extract content from document's pages
+        for i in pages:
+            # Extract text from the page, removing duplicate characters and accounting for text layout
+            text = self._get_page_text(i, 'toc')
+            # Filter out table of contents pages
+            if text and 'table of contents' not in text.lower() and \
+                not EXCLUDE_PATTERN.search(text):
+                # Collect line matched with defined patterns
+                toc.extend((line, i) for line in text.splitlines() if HEADING_PATTERN.match(line) and not EXCLUDE_PATTERN.search(line) and not EXCLUDE_SPACE_MW_PATTERN.search(line))
+
+        return toc
+
+
     def _filter_toc(self, toc):
         """
         Filters all possible headings based on pattern to create a structured list of sections 
@@ -164,29 +581,201 @@ class PDFExtraction:
 
         This code was inspired by the concepts and evolved from the preliminary framework, which is referenced in Appendix 5 of the main report.
         """
+        key = (start, end, start_keyword, end_keyword)
+        if key not in self.section_texts:
+            self.section_texts[key] = self._read_page_range(start, end, start_keyword, end_keyword)
+        return self.section_texts[key]
+
+
+    def _read_page_range(self, start, end, start_keyword, end_keyword):
+        """
+        Reads the text of a range of pages between specified start and end keywords.
+
+        Parameters:
+        - start (int): The starting page number.
+        - end (int): The ending page number.
+        - start_keyword (str): The keyword marking the start of extraction.
+        - end_keyword (str): The keyword marking the end of extraction.
+
+        Returns:
+        - The extracted text from the page range.
+        """
         texts = ''
 
         # Iteratively extract pages from given ranges
         for i in range(start, end+1):
-            if start == end:
-                # Filter out the content before and after the focusing section
-                cropped = self._crop_page(self.pdf.pages[i], start_keyword, end_keyword)
-            elif i == start:
-                # Filter out the content before the focusing starting keywords
-                cropped = self._crop_page(self.pdf.pages[i], start_keyword, '')
-            elif i == end:
-                # Filter out the content after the focusing section using end keywords
-                cropped = self._crop_page(self.pdf.pages[i], '', end_keyword)
-            else:
-                # Extract whole page between start and end pages
-                cropped = self.pdf.pages[i]
+            # Filter out the content before the starting keywords on the first page, and after the end keywords on the last page
+            page_start_keyword = start_keyword if i == start else ''
+            page_end_keyword = end_keyword if i == end else ''
+
+            # Crop the cached words and tables of the page, so each page is only laid out once for all sections
+            layout = self._crop_layout(*self._get_page_layout(i), self._get_page_rulings(i), page_start_keyword, page_end_keyword)
+            if layout is None:
+                try:
+                    # Tables are detected again from the cropped page when the crop removes some of the ruling lines
+                    layout = self._read_page(i, '_read_cropped_page', page_start_keyword, page_end_keyword)
+                except TimeoutError as e:
+                    # Otherwise keep the tables found on the whole page
+                    logging.warning(f'Page {i + 1} of {self.filename} cropped from the whole page layout: {e}')
+                    layout = self._crop_layout(*self._get_page_layout(i), [], page_start_keyword, page_end_keyword)
+
+            words, tables = layout
+            if self.strip_repeated_lines:
+                # Filter out the headers and footers repeated across pages, which carry no content of the section
+                words = self._strip_repeated_lines(words)
+            text = self._render_page(words, tables)
 
             # Fitler out the end keywords from the selected content
-            text = self._extract_page(cropped).replace(end_keyword, '')
+            text = text.replace(end_keyword, '')
             texts = texts + '\n' + text
         return texts
 
 
+    def _get_line_keys(self, words):
+        """
+        Identifies the leading and trailing lines of a page by their position and text, as candidates for headers and footers.
+
+        Parameters:
+        - words (list of tuples): The words of the page, each holding the attributes listed in WORD_KEYS.
+
+        Returns:
+        - list of tuples: The indexes of the words of each candidate line, and the key of the line.
+                          The key holds the rounded top position of the line, and its lowercase text with numbers masked,
+                          so page numbers and dates of any length do not prevent a footer from matching across pages.
+        """
+        store = WordStore(words)
+        lines = store._lines()
+        if len(lines) > 2 * REPEATED_LINE_CANDIDATES:
+            lines = lines[:REPEATED_LINE_CANDIDATES] + lines[-REPEATED_LINE_CANDIDATES:]
+
+        keys = []
+        for line in lines:
+            text = re.sub(r'\d+', '#', ' '.join(store.texts[i] for i in line).lower())
+            keys.append((line, (int(round(store.top[line].min())), text)))
+        return keys
+
+
+    def _get_repeated_lines(self):
+        """
+        Finds the headers and footers repeated across pages, by comparing the leading and trailing lines of pages sampled across the document.
+        The result is stored in the page cache, so it is computed once per document.
+
+        Returns:
+        - set: The keys of the repeated lines, as defined in _get_line_keys.
+        """
+        if self._repeated_lines is None:
+            self._repeated_lines = self.cache._get('repeated-lines') if self.cache else None
+
+        if self._repeated_lines is None:
+            # Sample pages evenly across the document
+            count = self._get_page_count()
+            pages = sorted(set(np.linspace(0, count - 1, min(count, REPEATED_LINE_SAMPLES)).round().astype(int).tolist()))
+
+            # Count the number of sampled pages where each line is found
+            counts = defaultdict(int)
+            for i in pages:
+                for key in {key for _, key in self._get_line_keys(self._get_page_words(i))}:
+                    counts[key] += 1
+
+            # A line found on a single page is never a header or footer
+            threshold = max(2, math.ceil(len(pages) * REPEATED_LINE_MIN_RATIO))
+            self._repeated_lines = {key for key, n in counts.items() if n >= threshold}
+            if self.cache:
+                self.cache._set('repeated-lines', None, self._repeated_lines)
+
+        return self._repeated_lines
+
+
+    def _get_page_words(self, i):
+        """
+        Gets the words of a page for finding repeated lines, reusing its cached layout if available.
+        Otherwise the words are read without detecting tables, as sampled pages may not be part of any extracted section.
+
+        Parameters:
+        - i (int): The zero-based page index.
+
+        Returns:
+        - list of tuples: The words of the page, each holding the attributes listed in WORD_KEYS.
+                          Empty if the page exceeds the time budget.
+        """
+        layout = self.cache._get('layout', i) if self.cache else None
+        if layout is None:
+            try:
+                layout = self._read_page(i, '_read_page_layout', False)
+            except TimeoutError as e:
+                logging.warning(f'Page {i + 1} of {self.filename} not sampled for repeated lines: {e}')
+                layout = ([], [])
+        return layout[0]
+
+
+    def _strip_repeated_lines(self, words):
+        """
+        Removes the headers and footers repeated across pages from the words of a page, recording the number of characters removed.
+
+        Parameters:
+        - words (list of tuples): The words of the page, each holding the attributes listed in WORD_KEYS.
+
+        Returns:
+        - list of tuples: The remaining words of the page.
+        """
+        repeated_lines = self._get_repeated_lines()
+        removed = set()
+        for line, key in self._get_line_keys(words):
+            if key in repeated_lines:
+                removed.update(line.tolist())
+
+        kept = [word for index, word in enumerate(words) if index not in removed]
+        self.repeated_line_stats['removed_chars'] += sum(len(words[index][0]) for index in removed)
+        self.repeated_line_stats['total_chars'] += sum(len(word[0]) for word in words)
+        return kept
+
+
+    def _crop_layout(self, words, tables, rulings, start_keyword, end_keyword):
+        """
+        Crops the words and tables of a page based on specified start and end keywords, the same as cropping the page itself.
+
+        Parameters:
+        - words (list of tuples): The words of the page, each holding the attributes listed in WORD_KEYS.
+        - tables (list of tuples): The tables of the page, each holding its coordinates and extracted rows.
+        - rulings (list of tuples): The top, bottom and vertical edge positions of the lines, rectangles and curves of the page.
+        - start_keyword (str): The keyword marking the top of the crop, searched case-insensitively.
+        - end_keyword (str): The keyword marking the bottom of the crop, searched case-sensitively.
+
+        Returns:
+        - tuple or None: The words and tables lying within the crop,
+                         or None if the ruling objects removed by the crop may change the tables found on the cropped page.
+        """
+        if not start_keyword and not end_keyword:
+            return words, tables
+
+        store = WordStore(words)
+        top, bottom = -np.inf, np.inf
+
+        # Get vertical position of the start keyword and the end keyword in a page
+        found = store._find(start_keyword, case=False)
+        if found is not None:
+            top = store.top[found].min()
+        found = store._find(end_keyword, case=True)
+        if found is not None:
+            bottom = store.bottom[found].max()
+
+        # Ruling objects outside the crop are removed from the cropped page, and they change the remaining tables
+        # if they are close enough to be joined with the kept edges, or to be snapped with the kept vertical edges
+        removed = [(r_top, r_bottom, xs) for r_top, r_bottom, xs in rulings if r_top < top or r_bottom > bottom]
+        if removed:
+            kept_xs = np.array([x for r_top, r_bottom, xs in rulings if r_top >= top and r_bottom <= bottom for x in xs])
+            for r_top, r_bottom, xs in removed:
+                if r_bottom >= top - RULING_TOLERANCE and r_top <= bottom + RULING_TOLERANCE:
+                    return None
+                if len(kept_xs) and any(np.any(np.abs(kept_xs - x) <= RULING_TOLERANCE) for x in xs):
+                    return None
+
+        # Keep words and tables fully within the vertical crop
+        words = [word for word, keep in zip(words, (store.top >= top) & (store.bottom <= bottom)) if keep]
+        tables = [table for table in tables if table[0][1] >= top and table[0][3] <= bottom]
+        return words, tables
+
+
     def _crop_page(self, page, start_keyword, end_keyword):
         """
         Crops the page based on specified start and end keywords.
@@ -232,79 +821,353 @@ class PDFExtraction:
 
         Code updated from : https://stackoverflow.com/questions/71612119/how-to-extract-texts-and-tables-pdfplumber
         """
+        return self._render_page(*self._read_layout(page))
 
-        # Find possible tables from provided page
-        tables = page.find_tables()
 
-        # Get table's coordinates
-        table_borders = [table.bbox for table in tables]
+    def _read_layout(self, page, find_tables=True):
+        """
+        Reads the words and tables from the provided page.
 
-        # Extract the content of each table and its vertical position on the page
-        extracted_tables = [{'table': table.extract(), 'doctop': table.bbox[1]} for table in tables]
+        Parameters:
+        - page (pdfplumber object): The page object initilized using pdfplumber.
+        - find_tables (bool, optional): Whether to detect tables, the most expensive step of parsing a page (default is True).
+
+        Returns:
+        - tuple: The words of the page, each holding the attributes listed in WORD_KEYS,
+                 and the tables of the page, each holding its coordinates and extracted rows.
+        """
+        # Classify the page cheaply to skip the expensive steps which cannot change its content
+        # Tables are only detected from ruling lines, rectangles and curves drawn on the page
+        has_rulings = find_tables and bool(page.lines or page.rects or page.curves)
+        has_duplicates = self._has_duplicate_chars(page)
+        self.page_profiles[page.page_number] = 'table' if has_rulings else 'dedupe' if has_duplicates else 'text' if find_tables else 'words'
+
+        # Find possible tables from provided page, and extract the content of each table
+        tables = [(table.bbox, table.extract()) for table in page.find_tables()] if has_rulings else []
 
         # Extract all words from the page, removing duplicates
-        all_words = page.dedupe_chars().extract_words()
+        page = page.dedupe_chars() if has_duplicates else page
+        words = [tuple(word[key] for key in WORD_KEYS) for word in page.extract_words()]
 
-        # Filter out words that are within the areas of the tables
-        filtered_words = [word for word in all_words if not any(self._is_word_within_table_area(word, bbox) for bbox in table_borders)]
-        final_text = ''
-        
-        # Cluster words and extracted tables based on their vertical position to keep the original layout
-        for cluster in pdfplumber.utils.cluster_objects(filtered_words + extracted_tables, 'doctop', tolerance=5):
-            if 'text' in cluster[0]:
-                final_text += '\n' + ' '.join(item['text'] for item in cluster)
-            elif 'table' in cluster[0]:
-                final_text += '\n' + str(cluster[0]['table'])
-        return final_text
+        return words, tables
 
 
-    def _is_word_within_table_area(self, word, table_area):
+    def _has_duplicate_chars(self, page):
         """
-        Checks if a word is located within a table's area.
+        Checks if removing duplicate characters would change the page, following the grouping of pdfplumber's dedupe_chars
+        without its costly reordering of the remaining characters.
 
         Parameters:
-        - word (dict): The word with its coordinates.
-        - table_area (tuple): The coordinates of the table.
+        - page (pdfplumber object): The page object initilized using pdfplumber.
 
         Returns:
-        - bool: True if the word is within the table's area, False otherwise.
+        - bool: True if at least two characters share the same text, font and position within 1 point, False otherwise.
+        """
+        # Group the positions of characters sharing the same text and font
+        groups = defaultdict(list)
+        for char in page.chars:
+            groups[(char['upright'], char['text'], char['fontname'], char['size'])].append((char['doctop'], char['x0']))
+
+        # Duplicates are characters clustered together both vertically and horizontally
+        for positions in groups.values():
+            if len(positions) < 2:
+                continue
+            positions = np.array(positions)
+            for line in cluster_positions(positions[:, 0], tolerance=1):
+                if len(line) > 1 and any(len(cluster) > 1 for cluster in cluster_positions(positions[line, 1], tolerance=1)):
+                    return True
+        return False
+
+
+    def _render_page(self, words, tables):
+        """
+        Combines the words and tables of a page into text, keeping the original layout.
+
+        Parameters:
+        - words (list of tuples): The words of the page, each holding the attributes listed in WORD_KEYS.
+        - tables (list of tuples): The tables of the page, each holding its coordinates and extracted rows.
+
+        Returns:
+        - The combined text and table content of the page.
 
         Code updated from : https://stackoverflow.com/questions/71612119/how-to-extract-texts-and-tables-pdfplumber
         """
-        word_area = (word['x0'], word['top'], word['x1'], word['bottom'])
-        return (word_area[0] > table_area[0] and
-                word_area[1] > table_area[1] and
-                word_area[2] < table_area[2] and
-                word_area[3] < table_area[3])
-    
+        # Hold word coordinates in arrays, and filter out words that are within the areas of the tables
+        store = WordStore(words)
+        store = store._select(~store._within_areas([bbox for bbox, _ in tables]))
+        final_text = ''
+
+        # Cluster words and tables based on their vertical position to keep the original layout
+        # Tables are positioned by the top of their borders, and placed after the words in case of the same cluster
+        positions = np.concatenate([store.doctop, [bbox[1] for bbox, _ in tables]])
+        for cluster in cluster_positions(positions, tolerance=5):
+            if cluster[0] < len(store):
+                final_text += '\n' + ' '.join(store.texts[i] for i in cluster if i < len(store))
+            for i in cluster[cluster >= len(store)]:
+                final_text += '\n' + self.serialize_table(tables[i - len(store)][1])
+        return final_text
+
 
-    def _search_keywords(self, keys):
+    def _search_keywords(self, keys, return_offsets=False):
         """
         Searches for specified keywords within the PDF document.
 
         Parameters:
-            keys (list): A list of keywords to search for in the PDF.
+            keys (list): A list of keywords to search for in the PDF, where '|' separates alternative spellings of the same keyword.
+            return_offsets (bool, optional): Whether to also return the character offsets of the matches in each page (default is False).
 
         Returns:
-            A dictionary where each key is a keyword and the value is a list of page numbers containing that keyword.
+            A dictionary where each key is a keyword and the value is a list of page numbers containing that keyword,
+            or a list of tuples of page number and the offsets of the keyword in that page if return_offsets is True.
         """        
         results = {key: [] for key in keys}
 
+        # Compile all keywords once, so each page is scanned a single time regardless of the number of keywords
+        matcher = KeywordMatcher(keys)
+
         # Iterate through all the pages
-        for _, page in enumerate(self.pdf.pages):
+        for i in range(self._get_page_count()):
 
             # Extract text from the current page
-            text = page.dedupe_chars().extract_text()
+            text = self._get_page_text(i, 'text')
+
+            # Append the page number to the result list for each keyword found in the page
+            for key, offsets in matcher._scan(text).items():
+                results[key].append((i + 1, offsets) if return_offsets else i + 1)
+
+        return results
+
+
+    def _get_page_count(self):
+        """
+        Gets the number of pages in the document, reading it from the page cache if available.
+
+        Returns:
+        - int: The number of pages.
+        """
+        count = self.cache._get('pages') if self.cache else None
+        if count is None:
+            count = len(self.pdf.pages)
+            if self.cache:
+                self.cache._set('pages', None, count)
+        return count
+
+
+    def _get_page_text(self, i, kind):
+        """
+        Extracts the text of a page with duplicate characters removed, reading it from the page cache if available.
+
+        Parameters:
+        - i (int): The zero-based page index.
+        - kind (str): The type of text defined in TEXT_SETTINGS.
+
+        Returns:
+        - str: The extracted text of the page, or an empty string if the page exceeds the time budget.
+        """
+        # Texts read with a fast text backend are cached separately from the texts read by pdfplumber only
+        cache_kind = kind if self.text_backend is None else f'{kind}-{self.text_backend.name}'
+
+        text = self.cache._get(cache_kind, i) if self.cache else None
+        if text is None:
+            complete = True
+            try:
+                text = self._read_page(i, '_read_page_text', kind)
+            except TimeoutError as e:
+                logging.warning(f'Page {i + 1} of {self.filename} skipped: {e}')
+                self.page_profiles[i + 1] = 'skipped'
+                text, complete = '', False
+
+            # Pages exceeding the time budget are only kept in memory, so later runs parse them again
+            if self.cache:
+                self.cache._set(cache_kind, i, text, persist=complete)
+        return text
+
+
+    def _get_page_layout(self, i):
+        """
+        Extracts the words and tables of a page, reading them from the page cache if available.
+
+        Parameters:
+        - i (int): The zero-based page index.
+
+        Returns:
+        - tuple: The words of the page, each holding the attributes listed in WORD_KEYS,
+                 and the tables of the page, each holding its coordinates and extracted rows.
+        """
+        layout = self.cache._get('layout', i) if self.cache else None
+        if layout is None:
+            complete = True
+            try:
+                layout = self._read_page(i, '_read_page_layout')
+            except TimeoutError as e:
+                complete = False
+                try:
+                    # Fall back to the words of the page, without detecting tables
+                    logging.warning(f'Page {i + 1} of {self.filename} extracted without tables: {e}')
+                    layout = self._read_page(i, '_read_page_layout', False)
+                except TimeoutError as e:
+                    logging.warning(f'Page {i + 1} of {self.filename} skipped: {e}')
+                    self.page_profiles[i + 1] = 'skipped'
+                    layout = ([], [])
+
+            # Pages exceeding the time budget are only kept in memory, so later runs parse them again
+            if self.cache:
+                self.cache._set('layout', i, layout, persist=complete)
+        return layout
+
+
+    def _get_page_rulings(self, i):
+        """
+        Gets the ruling objects used for detecting tables of a page, reading them from the page cache if available.
+
+        Parameters:
+        - i (int): The zero-based page index.
+
+        Returns:
+        - list of tuples: The top and bottom position of each line, rectangle and curve,
+                          with the horizontal positions where it may form vertical table edges.
+                          Empty if the page exceeds the time budget.
+        """
+        rulings = self.cache._get('rulings', i) if self.cache else None
+        if rulings is None:
+            complete = True
+            try:
+                rulings = self._read_page(i, '_read_page_rulings')
+            except TimeoutError as e:
+                logging.warning(f'Page {i + 1} of {self.filename} cropped without ruling objects: {e}')
+                rulings, complete = [], False
+
+            # Pages exceeding the time budget are only kept in memory, so later runs parse them again
+            if self.cache:
+                self.cache._set('rulings', i, rulings, persist=complete)
+        return rulings
+
+
+    def _read_page(self, i, method, *args):
+        """
+        Parses a page with the given method, in the watchdog process if a page time budget is set.
+
+        Parameters:
+        - i (int): The zero-based page index.
+        - method (str): The name of the method reading the page, such as '_read_page_text'.
+        - *args: The remaining arguments of the method.
+
+        Returns:
+        - The result of the method.
+
+        Raises:
+        - TimeoutError: If the page exceeds the time budget.
+        """
+        if self.watchdog is None:
+            return getattr(self, method)(i, *args)
+
+        result, profiles, backends = self.watchdog._run(method, i, *args)
+        self.page_profiles.update(profiles)
+        self.page_backends.update(backends)
+        return result
+
+
+    def _read_page_text(self, i, kind):
+        """
+        Reads the text of a page with duplicate characters removed.
+
+        Parameters:
+        - i (int): The zero-based page index.
+        - kind (str): The type of text defined in TEXT_SETTINGS.
+
+        Returns:
+        - str: The extracted text of the page.
+        """
+        # Prose pages are read by the fast text backend, and pages which may hold tables by pdfplumber
+        if self.text_backend is not None:
+            text = self.text_backend._extract_text(i)
+            if text is not None:
+                self.page_backends[i + 1] = self.text_backend.name
+                return text
+
+        self.page_backends[i + 1] = 'pdfplumber'
+        page = self._get_page(i)
+        return (page.dedupe_chars() if self._has_duplicate_chars(page) else page).extract_text(**TEXT_SETTINGS[kind])
+
+
+    def _read_page_layout(self, i, find_tables=True):
+        """
+        Reads the words and tables of a page.
+
+        Parameters:
+        - i (int): The zero-based page index.
+        - find_tables (bool, optional): Whether to detect tables (default is True).
+
+        Returns:
+        - tuple: The words and tables of the page, as returned by _read_layout.
+        """
+        return self._read_layout(self._get_page(i), find_tables)
+
+
+    def _read_page_rulings(self, i):
+        """
+        Reads the ruling objects of a page.
+
+        Parameters:
+        - i (int): The zero-based page index.
+
+        Returns:
+        - list of tuples: The top and bottom position of each line, rectangle and curve,
+                          with the horizontal positions where it may form vertical table edges.
+        """
+        page = self._get_page(i)
+        return [(obj['top'], obj['bottom'], (obj['x0'], obj['x1'])) for obj in page.rects] + \
+               [(obj['top'], obj['bottom'], () if obj['top'] == obj['bottom'] else (obj['x0'],)) for obj in page.lines] + \
+               [(obj['top'], obj['bottom'], tuple(p0[0] for p0, p1 in zip(obj['pts'], obj['pts'][1:]) if p0[0] == p1[0])) for obj in page.curves]
+
+
+    def _read_cropped_page(self, i, start_keyword, end_keyword):
+        """
+        Crops a page based on specified start and end keywords, and reads its words and tables.
+
+        Parameters:
+        - i (int): The zero-based page index.
+        - start_keyword (str): The keyword marking the top of the crop.
+        - end_keyword (str): The keyword marking the bottom of the crop.
+
+        Returns:
+        - tuple: The words and tables of the cropped page, as returned by _read_layout.
+        """
+        return self._read_layout(self._crop_page(self._get_page(i), start_keyword, end_keyword))
+
+
+def _scan_headings(filename, options, pages):
+    """
+    Collects all possible headings from the given pages in a worker process.
+
+    Parameters:
+    - filename (str): The path to the PDF file to be processed.
+    - options (dict): The options of the PDFExtraction instance, such as the page cache directory.
+    - pages (iterable of int): The zero-based indexes of the pages to be scanned.
+
+    Returns:
+    - tuple: The possible headings and the page index where each heading is found,
+             and the engine which has read each parsed page.
+    """
+    with PDFExtraction(filename, workers=1, **options) as pdf_extractor:
+        return pdf_extractor._scan_headings(pages), pdf_extractor.page_backends
 
-            # Check for each keyword
-            for key in keys:
-                pattern = re.escape(key) if '|' not in key else key
 
-                # Search for the pattern in the text
-                if re.search(pattern, text, re.IGNORECASE):
+def _read_pages(filename, options, pages):
+    """
+    Parses the layout of the given pages into the page cache in a worker process.
 
-                    # Append the page number to the result list for that keyword
-                    results[key].append(page.page_number)
-            page.flush_cache()   
+    Parameters:
+    - filename (str): The path to the PDF file to be processed.
+    - options (dict): The options of the PDFExtraction instance, such as the page cache directory.
+    - pages (iterable of int): The zero-based indexes of the pages to be parsed.
 
-        return results
\ No newline at end of file
+    Returns:
+    - tuple: The extraction profile chosen for each parsed page, keyed by page number,
+             and the entries of the pages exceeding the time budget, which are not stored in the page cache.
+    """
+    with PDFExtraction(filename, workers=1, **options) as pdf_extractor:
+        for i in pages:
+            pdf_extractor._get_page_layout(i)
+            pdf_extractor._get_page_rulings(i)
+        return pdf_extractor.page_profiles, {key: pdf_extractor.cache.entries[key] for key in pdf_extractor.cache.unsaved}
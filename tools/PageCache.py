@@ -0,0 +1,103 @@
+import hashlib
+import os
+import pickle
+import zlib
+
+
+class PageCache:
+    def __init__(self, filename, cache_dir, version):
+        """
+        Initializes the PageCache class.
+
+        Parameters:
+        - filename (str): The path to the PDF file whose pages are cached.
+        - cache_dir (str): The local directory storing the cached pages of all documents.
+        - version (int): The format version of the cached pages, entries of other versions being ignored.
+        """
+        self.key = hash_file(filename)
+        self.directory = os.path.join(cache_dir, f'v{version}', self.key)
+        self.entries = {}
+
+        # Entries kept in memory only, such as pages exceeding the time budget
+        self.unsaved = set()
+
+
+    def _path(self, kind, page):
+        """
+        Builds the location of a cached entry.
+
+        Parameters:
+        - kind (str): The type of the cached content (such as 'text' or 'layout').
+        - page (int or None): The zero-based page index, or None for document level entries.
+
+        Returns:
+        - str: The path to the cached entry.
+        """
+        name = kind if page is None else f'{kind}-{page}'
+        return os.path.join(self.directory, f'{name}.bin')
+
+
+    def _get(self, kind, page=None):
+        """
+        Reads a cached entry from memory or from the local directory.
+
+        Parameters:
+        - kind (str): The type of the cached content.
+        - page (int, optional): The zero-based page index.
+
+        Returns:
+        - The cached value, or None if the entry has not been cached yet.
+        """
+        if (kind, page) not in self.entries:
+            path = self._path(kind, page)
+            if not os.path.exists(path):
+                return None
+
+            # Entries are stored as compressed pickles to keep the cache compact
+            with open(path, 'rb') as f:
+                self.entries[(kind, page)] = pickle.loads(zlib.decompress(f.read()))
+
+        return self.entries[(kind, page)]
+
+
+    def _set(self, kind, page, value, persist=True):
+        """
+        Stores an entry in memory and persists it to the local directory.
+
+        Parameters:
+        - kind (str): The type of the cached content.
+        - page (int or None): The zero-based page index, or None for document level entries.
+        - value: The value to be cached.
+        - persist (bool, optional): Whether to write the entry to the local directory, or keep it in memory only (default is True).
+        """
+        self.entries[(kind, page)] = value
+        if not persist:
+            self.unsaved.add((kind, page))
+            return
+        self.unsaved.discard((kind, page))
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Write to a temporary file first, so concurrent readers never see a partially written entry
+        path = self._path(kind, page)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+        os.replace(temp_path, path)
+
+
+def hash_file(filename):
+    """
+    Computes the sha256 digest of the PDF content, so renamed or re-downloaded copies share the same cache.
+
+    Parameters:
+    - filename (str): The path to the PDF file.
+
+    Returns:
+    - str: The hexadecimal digest of the file.
+    """
+    hashing = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for buf in iter(lambda: f.read(8192), b''):
+            hashing.update(buf)
+    return hashing.hexdigest()
@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import pandas as pd
+from config import config
+from tools.PageCache import hash_file
+from tools.PDFExtraction import PDFExtraction
+
+
+class PageIndex:
+    def __init__(self, database=config.PAGE_INDEX_DB):
+        """
+        Initializes the PageIndex class, storing the extracted text of each PDF page in a local full-text index.
+
+        Parameters:
+        - database (str, optional): The path to the SQLite database file (default is config.PAGE_INDEX_DB).
+        """
+        os.makedirs(os.path.dirname(database) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(database)
+
+        # Trigram tokenizer supports case-insensitive substring search, the same as searching keywords in page text
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (filename TEXT PRIMARY KEY, project_id TEXT, sha256 TEXT, pages INTEGER);
+            CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5(text, project_id UNINDEXED, filename UNINDEXED, page_number UNINDEXED, tokenize='trigram');
+        """)
+
+
+    def _add_document(self, filepath):
+        """
+        Adds the text of every page of a PDF file to the index, skipping files already indexed with the same content.
+
+        Parameters:
+        - filepath (str): The path to the PDF file to be indexed.
+
+        Returns:
+        - bool: True if the file has been (re)indexed, False if it was already up to date.
+        """
+        filename = os.path.basename(filepath)
+        sha = hash_file(filepath)
+
+        row = self.connection.execute('SELECT sha256 FROM documents WHERE filename = ?', (filename,)).fetchone()
+        if row and row[0] == sha:
+            return False
+
+        # Extract text of all pages, reusing the page cache for documents parsed before
+        project_id = filename.split('_', 1)[0]
+        with PDFExtraction(filepath) as pdf_extractor:
+            pages = [(pdf_extractor._get_page_text(i, 'text'), project_id, filename, i + 1) for i in range(pdf_extractor._get_page_count())]
+
+        # Replace all records of the file in one transaction
+        with self.connection:
+            self.connection.execute('DELETE FROM pages WHERE filename = ?', (filename,))
+            self.connection.executemany('INSERT INTO pages (text, project_id, filename, page_number) VALUES (?, ?, ?, ?)', pages)
+            self.connection.execute('INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)', (filename, project_id, sha, len(pages)))
+        return True
+
+
+    def _search(self, query, filename=None):
+        """
+        Searches pages matching a full-text query.
+
+        Parameters:
+        - query (str): The FTS5 query, such as '"project proponent" OR "project owner"'.
+        - filename (str, optional): Restrict the search to a single PDF file.
+
+        Returns:
+        - DataFrame: The project ID, filename and page number of each matching page.
+        """
+        sql = 'SELECT project_id, filename, page_number FROM pages WHERE pages MATCH ?'
+        params = [query]
+        if filename:
+            sql += ' AND filename = ?'
+            params.append(filename)
+
+        return pd.read_sql_query(sql + ' ORDER BY filename, page_number', self.connection, params=params)
+
+
+    def _search_keywords(self, filename, keys):
+        """
+        Searches for specified keywords within an indexed PDF file, returning the same result as PDFExtraction._search_keywords.
+
+        Parameters:
+            filename (str): The name of the indexed PDF file.
+            keys (list): A list of keywords, where '|' separates alternative spellings of the same keyword.
+                         Spellings shorter than three characters cannot be searched with trigrams.
+
+        Returns:
+            A dictionary where each key is a keyword and the value is a list of page numbers containing that keyword.
+        """
+        results = {}
+        for key in keys:
+            # Quote each spelling as a phrase, so it is matched as a substring
+            query = ' OR '.join('"{}"'.format(variant.replace('"', '""')) for variant in key.split('|') if variant)
+            results[key] = self._search(query, filename)['page_number'].tolist()
+        return results
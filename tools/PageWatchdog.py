@@ -0,0 +1,123 @@
+import multiprocessing
+
+
+class PageWatchdog:
+    def __init__(self, filename, timeout, options):
+        """
+        Initializes the PageWatchdog class, parsing pages in a child process which is stopped once a page exceeds its time budget.
+
+        Parameters:
+        - filename (str): The path to the PDF file to be processed.
+        - timeout (float): The maximum number of seconds allowed for extracting a single page.
+        - options (dict): The options of the PDFExtraction instance extracting pages in the child process.
+        """
+        self.filename = filename
+        self.timeout = timeout
+        self.options = options
+        self.process = None
+        self.connection = None
+
+
+    def _start(self):
+        """
+        Starts the child process, which keeps the PDF file open across pages.
+        Opening the file is not counted in the time budget of the pages.
+        """
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve, args=(self.filename, self.options, child_connection), daemon=True)
+        self.process.start()
+        child_connection.close()
+
+        # Wait until the file is opened, and raise the error if it cannot be read
+        error, _, _, _ = self.connection.recv()
+        if error is not None:
+            self._stop()
+            raise error
+
+
+    def _stop(self):
+        """
+        Kills the child process, abandoning the page being extracted.
+        """
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+            self.connection.close()
+            self.process = None
+            self.connection = None
+
+
+    def _run(self, method, *args):
+        """
+        Runs a PDFExtraction method in the child process within the time budget.
+
+        Parameters:
+        - method (str): The name of the PDFExtraction method to be called.
+        - *args: The arguments of the method.
+
+        Returns:
+        - tuple: The result of the method, and the extraction profiles and text engines of the pages parsed by the call.
+
+        Raises:
+        - TimeoutError: If the page is not extracted within the time budget, or the child process dies while extracting it.
+        """
+        if self.process is None:
+            self._start()
+
+        self.connection.send((method, args))
+
+        # A pathological page is abandoned, and a new child process is started for the next page
+        if not self.connection.poll(self.timeout):
+            self._stop()
+            raise TimeoutError(f'{method}{args} exceeded {self.timeout} seconds')
+
+        try:
+            error, result, profiles, backends = self.connection.recv()
+        except EOFError:
+            self._stop()
+            raise TimeoutError(f'{method}{args} stopped the page extraction process')
+
+        if error is not None:
+            raise error
+        return result, profiles, backends
+
+
+    def __del__(self):
+        self._stop()
+
+
+def _serve(filename, options, connection):
+    """
+    Extracts pages requested by the supervising process, until the connection is closed.
+
+    Parameters:
+    - filename (str): The path to the PDF file to be processed.
+    - options (dict): The options of the PDFExtraction instance extracting pages.
+    - connection (Connection): The connection to the supervising process.
+    """
+    # Imported here, as PDFExtraction depends on this module
+    from tools.PDFExtraction import PDFExtraction
+
+    # Results are cached by the supervising process, and pages are not watched again inside the child process
+    pdf_extractor = PDFExtraction(filename, workers=1, **{**options, 'cache_dir': None, 'page_timeout': None})
+
+    try:
+        pdf_extractor.pdf
+        connection.send((None, None, {}, {}))
+    except Exception as e:
+        connection.send((e, None, {}, {}))
+        return
+
+    while True:
+        try:
+            method, args = connection.recv()
+        except EOFError:
+            pdf_extractor.close()
+            break
+
+        try:
+            connection.send((None, getattr(pdf_extractor, method)(*args), pdf_extractor.page_profiles, pdf_extractor.page_backends))
+        except Exception as e:
+            connection.send((e, None, pdf_extractor.page_profiles, pdf_extractor.page_backends))
+        pdf_extractor.page_profiles = {}
+        pdf_extractor.page_backends = {}
@@ -0,0 +1,98 @@
+import ctypes
+import pypdfium2
+import pypdfium2.raw as pdfium_c
+
+# Minimum length of the edges kept by pdfplumber's table detection
+EDGE_MIN_LENGTH = 3
+
+
+class PdfiumTextBackend:
+    # Name recorded for the pages read by this backend
+    name = 'pdfium'
+
+    def __init__(self, filename):
+        """
+        Initializes the PdfiumTextBackend class, reading the plain text of prose pages with pdfium,
+        which is much faster than laying out the characters with pdfplumber.
+
+        Parameters:
+        - filename (str): The path to the PDF file to be processed.
+        """
+        self.filename = filename
+        self._pdf = None
+
+
+    @property
+    def pdf(self):
+        """
+        Opens the PDF file on first access.
+
+        Returns:
+        - The opened pdfium document.
+        """
+        if self._pdf is None:
+            self._pdf = pypdfium2.PdfDocument(self.filename)
+        return self._pdf
+
+
+    def close(self):
+        """
+        Closes the PDF file.
+        """
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+
+    def _extract_text(self, i):
+        """
+        Extracts the plain text of a page, unless the page draws paths which may form tables.
+        pdfplumber only finds tables where horizontal and vertical edges intersect,
+        so pages drawing only horizontal rules, such as header and footer lines, are read as plain text.
+
+        Parameters:
+        - i (int): The zero-based page index.
+
+        Returns:
+        - str or None: The text of the page, or None if the page has to be read by pdfplumber.
+        """
+        page = self.pdf[i]
+        try:
+            # Lines, rectangles and curves are all path objects, including those nested in form objects
+            has_horizontal, has_vertical = False, False
+            for path in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_PATH]):
+                left, bottom, right, top = _get_bounds(path)
+                has_horizontal = has_horizontal or right - left >= EDGE_MIN_LENGTH
+                has_vertical = has_vertical or top - bottom >= EDGE_MIN_LENGTH
+                if has_horizontal and has_vertical:
+                    return None
+
+            textpage = page.get_textpage()
+            text = textpage.get_text_range()
+            textpage.close()
+        finally:
+            page.close()
+
+        # Follow the line separators of pdfplumber, without trailing spaces
+        return '\n'.join(line.rstrip() for line in text.splitlines())
+
+
+def _get_bounds(obj):
+    """
+    Gets the bounding box of a page object through the pdfium API, which is named differently across pypdfium2 versions.
+
+    Parameters:
+    - obj (PdfObject): The page object.
+
+    Returns:
+    - tuple: The left, bottom, right and top coordinates of the object.
+    """
+    bounds = [ctypes.c_float() for _ in range(4)]
+    pdfium_c.FPDFPageObj_GetBounds(obj.raw, *(ctypes.byref(bound) for bound in bounds))
+    return tuple(bound.value for bound in bounds)
+
+
+# Fast text backends selectable by name, pages are read by pdfplumber otherwise
+TEXT_BACKENDS = {
+    PdfiumTextBackend.name: PdfiumTextBackend,
+}
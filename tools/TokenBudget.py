@@ -0,0 +1,86 @@
+import tiktoken
+from config import config
+
+
+def get_encoding(model):
+    """
+    Gets the tokenizer of an OpenAI model, including fine-tuned models named after their base model.
+
+    Parameters:
+    - model (str): The model name, such as 'gpt-3.5-turbo' or 'ft:gpt-3.5-turbo-0125:org::id'.
+
+    Returns:
+    - Encoding: The tiktoken encoding of the model, or config.DEFAULT_ENCODING for unknown models.
+    """
+    try:
+        return tiktoken.encoding_for_model(_get_base_model(model))
+    except KeyError:
+        return tiktoken.get_encoding(config.DEFAULT_ENCODING)
+
+
+def get_token_budget(model):
+    """
+    Gets the maximum number of context tokens sent to a model per record.
+
+    Parameters:
+    - model (str): The model name.
+
+    Returns:
+    - int: The budget of the longest model prefix in config.CONTEXT_TOKEN_BUDGETS, or config.DEFAULT_CONTEXT_TOKENS.
+    """
+    base_model = _get_base_model(model)
+    prefixes = [prefix for prefix in config.CONTEXT_TOKEN_BUDGETS if base_model.startswith(prefix)]
+    return config.CONTEXT_TOKEN_BUDGETS[max(prefixes, key=len)] if prefixes else config.DEFAULT_CONTEXT_TOKENS
+
+
+def count_tokens(text, encoding):
+    """
+    Counts the tokens of a text, treating special tokens found in PDFs as plain text.
+
+    Parameters:
+    - text (str): The text.
+    - encoding (Encoding): The tiktoken encoding.
+
+    Returns:
+    - int: The number of tokens.
+    """
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def pack_chunks(texts, encoding, budget):
+    """
+    Packs chunks into a context of at most the given number of tokens, following their order of relevance.
+    Chunks which do not fit are skipped in favour of shorter ones, and the first chunk is truncated if it exceeds the budget alone.
+
+    Parameters:
+    - texts (list): The chunk texts, from the most relevant.
+    - encoding (Encoding): The tiktoken encoding.
+    - budget (int): The maximum number of tokens of the context.
+
+    Returns:
+    - list: The packed chunk texts, from the most relevant.
+    """
+    packed, used = [], 0
+    for text in texts:
+        # Chunks are joined by line breaks, which take a token each
+        tokens = count_tokens(text, encoding) + (1 if packed else 0)
+        if used + tokens <= budget:
+            packed.append(text)
+            used += tokens
+        elif not packed:
+            packed.append(encoding.decode(encoding.encode(text, disallowed_special=())[:budget]))
+            used = budget
+    return packed
+
+
+def _get_base_model(model):
+    """
+    Gets the name of the base model of a fine-tuned model.
+
+    Parameters:
+    - model (str): The model name.
+
+    Returns:
+    - str: The base model name, or the given name if it is not a fine-tuned model.
+    """
+    return model.split(':')[1] if model.startswith('ft:') else model
@@ -0,0 +1,96 @@
+import numpy as np
+
+# Similarity above which two retrieved chunks are considered redundant, the default of EmbeddingsRedundantFilter
+REDUNDANCY_THRESHOLD = 0.95
+
+
+class VectorRetriever:
+    def __init__(self, documents, embedding, vectors=None):
+        """
+        Initializes the VectorRetriever class, keeping the embeddings of the documents in an in-memory matrix.
+        It retrieves the same documents as a cosine Chroma store followed by EmbeddingsRedundantFilter and EmbeddingsFilter,
+        without writing a vector store to disk.
+
+        Parameters:
+        - documents (list): The documents to retrieve from.
+        - embedding (Embeddings): The embedding model encoding the documents and queries.
+        - vectors (list of lists, optional): The precomputed embeddings of the documents, encoded by the embedding model if not given.
+        """
+        self.documents = documents
+        self.embedding = embedding
+        if vectors is None:
+            vectors = embedding.embed_documents([doc.page_content for doc in documents])
+        self.matrix = _normalize(vectors)
+
+
+    def _search(self, query, k):
+        """
+        Finds the documents most similar to a query.
+
+        Parameters:
+        - query (str): The query text.
+        - k (int): The number of documents to retrieve.
+
+        Returns:
+        - tuple: The indexes of the k most similar documents, from the most similar, and the similarity of every document.
+        """
+        similarity = self.matrix @ _normalize([self.embedding.embed_query(query)])[0]
+        return np.argsort(-similarity, kind='stable')[:k], similarity
+
+
+    def _filter_redundant(self, indexes, threshold=REDUNDANCY_THRESHOLD):
+        """
+        Removes near-duplicate documents, following EmbeddingsRedundantFilter:
+        pairs are visited from the most similar, and the earlier document of a pair is dropped if both are still kept.
+
+        Parameters:
+        - indexes (ndarray): The indexes of the retrieved documents, in retrieval order.
+        - threshold (float, optional): The similarity above which two documents are redundant (default is REDUNDANCY_THRESHOLD).
+
+        Returns:
+        - ndarray: The indexes of the kept documents, in retrieval order.
+        """
+        vectors = self.matrix[indexes]
+        similarity = np.tril(vectors @ vectors.T, k=-1)
+        pairs = np.column_stack(np.where(similarity > threshold))
+        order = np.argsort(similarity[similarity > threshold])[::-1]
+
+        kept = set(range(len(indexes)))
+        for later, earlier in pairs[order]:
+            if later in kept and earlier in kept:
+                kept.remove(earlier)
+        return indexes[sorted(kept)]
+
+
+    def _invoke(self, query, k, top_n=1):
+        """
+        Retrieves the k documents most similar to a query, removes redundant documents,
+        and keeps the most similar of the remaining ones.
+
+        Parameters:
+        - query (str): The query text.
+        - k (int): The number of documents to retrieve before removing redundant ones.
+        - top_n (int, optional): The number of documents returned (default is 1).
+
+        Returns:
+        - list: The selected documents, from the most similar.
+        """
+        indexes, similarity = self._search(query, k)
+        indexes = self._filter_redundant(indexes)
+        best = indexes[np.argsort(similarity[indexes])[::-1][:top_n]]
+        return [self.documents[i] for i in best]
+
+
+def _normalize(vectors):
+    """
+    Scales vectors to unit length, so their dot products are cosine similarities.
+
+    Parameters:
+    - vectors (list of lists): The vectors to be normalized.
+
+    Returns:
+    - ndarray: The normalized vectors, one per row.
+    """
+    matrix = np.asarray(vectors, dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
@@ -0,0 +1,130 @@
+import re
+import numpy as np
+
+
+class WordStore:
+    def __init__(self, words):
+        """
+        Initializes the WordStore class, holding word coordinates in NumPy arrays for vectorized operations.
+
+        Parameters:
+        - words (list of tuples): The words of a page, each holding its text, x0, top, x1, bottom and doctop.
+        """
+        self.texts = [word[0] for word in words]
+        coords = np.array([word[1:] for word in words], dtype=float).reshape(-1, 5)
+        self.x0, self.top, self.x1, self.bottom, self.doctop = coords.T
+
+
+    def __len__(self):
+        return len(self.texts)
+
+
+    def _select(self, mask):
+        """
+        Selects a subset of words.
+
+        Parameters:
+        - mask (ndarray): A boolean mask of the words to be kept.
+
+        Returns:
+        - WordStore: A new store containing only the selected words, in their original order.
+        """
+        store = WordStore([])
+        store.texts = [text for text, keep in zip(self.texts, mask) if keep]
+        store.x0, store.top, store.x1, store.bottom, store.doctop = \
+            self.x0[mask], self.top[mask], self.x1[mask], self.bottom[mask], self.doctop[mask]
+        return store
+
+
+    def _within_areas(self, areas):
+        """
+        Checks which words are located within any of the given areas.
+
+        Parameters:
+        - areas (list of tuples): The coordinates (x0, top, x1, bottom) of the areas, such as table borders.
+
+        Returns:
+        - ndarray: A boolean mask, True for words lying strictly inside at least one area.
+        """
+        if not len(areas) or not len(self):
+            return np.zeros(len(self), dtype=bool)
+
+        # Compare every word against every area at once, with words along the rows and areas along the columns
+        areas = np.array(areas, dtype=float)
+        inside = (self.x0[:, None] > areas[:, 0]) & \
+                 (self.top[:, None] > areas[:, 1]) & \
+                 (self.x1[:, None] < areas[:, 2]) & \
+                 (self.bottom[:, None] < areas[:, 3])
+        return inside.any(axis=1)
+
+
+    def _lines(self, tolerance=3):
+        """
+        Groups words into lines by their top position, the same way as pdfplumber's page text.
+
+        Parameters:
+        - tolerance (float, optional): The maximum vertical distance between words of the same line (default is 3).
+
+        Returns:
+        - list of ndarray: The indexes of the words in each line from top to bottom, ordered from left to right.
+        """
+        return [line[np.argsort(self.x0[line], kind='stable')] for line in cluster_positions(self.top, tolerance)]
+
+
+    def _find(self, keyword, case=True):
+        """
+        Finds the first occurrence of a keyword in the text of the words, rebuilt line by line
+        the same way as pdfplumber's page text, so a phrase can span several words of a line.
+
+        Parameters:
+        - keyword (str): The literal text to be searched.
+        - case (bool, optional): Whether the search is case-sensitive (default is True).
+
+        Returns:
+        - ndarray or None: The indexes of the words covered by the first match, or None if the keyword is not found.
+        """
+        if not keyword or not len(self):
+            return None
+
+        lines = self._lines()
+        order = np.concatenate(lines)
+
+        # Words are joined by spaces and lines by newlines, so each word starts one character after the previous one ends
+        full_text = '\n'.join(' '.join(self.texts[i] for i in line) for line in lines)
+        starts = np.cumsum([0] + [len(self.texts[i]) + 1 for i in order[:-1]])
+
+        match = re.search(re.escape(keyword), full_text, 0 if case else re.IGNORECASE)
+        if match is None:
+            return None
+
+        # Words overlapping the matched characters
+        first = np.searchsorted(starts, match.start(), side='right') - 1
+        last = np.searchsorted(starts, match.end() - 1, side='right') - 1
+        return order[first:last + 1]
+
+
+def cluster_positions(values, tolerance):
+    """
+    Groups positions into clusters, chaining sorted distinct positions which are within the tolerance of the previous one.
+    This follows the same grouping as pdfplumber.utils.cluster_objects, using a single sort instead of Python loops.
+
+    Parameters:
+    - values (array-like): The positions of the objects, such as their vertical positions.
+    - tolerance (float): The maximum distance between consecutive positions of the same cluster.
+
+    Returns:
+    - list of ndarray: The indexes of the objects in each cluster, ordered by position,
+                       keeping the original order of objects within a cluster.
+    """
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        return []
+
+    # Start a new cluster wherever the gap to the previous distinct position exceeds the tolerance
+    unique = np.unique(values)
+    cluster_ids = np.concatenate([[0], np.cumsum(unique[1:] > unique[:-1] + tolerance)])
+    labels = cluster_ids[np.searchsorted(unique, values)]
+
+    # Stable sort keeps objects of the same cluster in their original order
+    order = np.argsort(labels, kind='stable')
+    return np.split(order, np.flatnonzero(np.diff(labels[order])) + 1)